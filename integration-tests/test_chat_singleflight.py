@@ -0,0 +1,88 @@
+"""In-flight dedupe for chat_with_meta(dedupe_inflight=True) (no network)."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+os.environ.setdefault("OPENROUTER_DISABLE_RETRY", "1")
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+async def test_followers_share_result() -> Tuple[bool, str]:
+    from src import or_client
+
+    calls = 0
+
+    async def call() -> tuple[str, Dict[str, Any]]:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "hello", {"id": "gen-1", "messages": [{"role": "assistant", "content": "hello"}]}
+
+    results = await asyncio.gather(*(or_client._singleflight("shared", call) for _ in range(3)))
+    if calls != 1:
+        return False, f"expected one upstream call, got {calls}"
+    expected = {"id": "gen-1", "messages": [{"role": "assistant", "content": "hello"}]}
+    if any(content != "hello" or meta != expected for content, meta in results):
+        return False, f"unexpected results: {results!r}"
+    if len({id(meta) for _, meta in results}) != 3:
+        return False, "followers share a meta dict with the leader"
+    # Editing one caller's conversation must not leak into the others.
+    results[1][1]["messages"].append({"role": "user", "content": "next"})
+    results[2][1]["messages"][0]["content"] = "edited"
+    if results[0][1]["messages"] != expected["messages"]:
+        return False, "followers share the leader's conversation"
+    if or_client._INFLIGHT:
+        return False, "in-flight slot not cleared"
+    return True, "followers reuse the leader's result"
+
+
+async def test_leader_cancellation_not_inherited() -> Tuple[bool, str]:
+    from src import or_client
+
+    calls = 0
+
+    async def call() -> tuple[str, Dict[str, Any]]:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return f"reply-{calls}", {}
+
+    leader = asyncio.create_task(or_client._singleflight("cancel", call))
+    await asyncio.sleep(0)
+    followers = [asyncio.create_task(or_client._singleflight("cancel", call)) for _ in range(2)]
+    await asyncio.sleep(0.01)
+    leader.cancel()
+    done = await asyncio.gather(leader, *followers, return_exceptions=True)
+    if not leader.cancelled():
+        return False, "leader should be cancelled"
+    if any(f.cancelled() for f in followers):
+        return False, "follower inherited the leader's cancellation"
+    if done[1:] != [("reply-2", {}), ("reply-2", {})]:
+        return False, f"followers should share one re-issued call, got {done[1:]!r}"
+    if calls != 2:
+        return False, f"expected the call to be re-issued once, got {calls} calls"
+    return True, "followers re-issue the call after the leader is cancelled"
+
+
+async def main() -> int:
+    failures = 0
+    for name, test in (
+        ("Singleflight shared result", test_followers_share_result),
+        ("Singleflight leader cancelled", test_leader_cancellation_not_inherited),
+    ):
+        ok, info = await test()
+        print(f"[ {'OK' if ok else 'FAIL'} ] {name}: {info}")
+        failures += 0 if ok else 1
+    return 0 if failures == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
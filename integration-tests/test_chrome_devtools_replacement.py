@@ -75,6 +75,29 @@ async def test_devtools_methods_without_server() -> None:
     assert isinstance(trace, dict) and trace.get("fps") == 60
 
 
+@pytest.mark.asyncio
+async def test_screenshot_bytes_skip_data_url() -> None:
+    service = ChromeDevToolsService(enabled=False)
+    service.enabled = True
+    evals: list[str] = []
+
+    async def fake_eval(self, script: str, *, is_function: bool = False):
+        evals.append(script)
+        return True
+
+    async def fake_call_tool(self, name: str, arguments: dict | None = None) -> dict:
+        assert name == "take_screenshot"
+        return {"content": [{"type": "image", "mimeType": "image/png", "data": "ZmFrZQ=="}]}
+
+    service.evaluate_script_mcp = fake_eval.__get__(service, ChromeDevToolsService)  # type: ignore[attr-defined]
+    service._call_tool = fake_call_tool.__get__(service, ChromeDevToolsService)  # type: ignore[attr-defined]
+
+    assert await service.take_screenshot_bytes_mcp(wait_ready=False) == b"fake"
+    assert evals == []
+    assert await service.take_screenshot_bytes_mcp() == b"fake"
+    assert len(evals) == 1
+
+
 @pytest.mark.asyncio
 async def test_waits_for_load_before_actions() -> None:
     service = ChromeDevToolsService(enabled=False)
@@ -0,0 +1,72 @@
+"""Warm DevTools sessions do not outlive their event loop (fake MCP server, no Chrome)."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from test_mcp_client_concurrency import FAKE_SERVER  # noqa: E402
+
+
+def _process_gone(pid: int, timeout_s: float = 3.0) -> bool:
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_loop_change_kills_idle_sessions() -> Tuple[bool, str]:
+    from src import services
+    from src.chrome_devtools_service import ChromeDevToolsService
+
+    def fake_service() -> ChromeDevToolsService:
+        service = ChromeDevToolsService(enabled=False)
+        service.enabled = True
+        service._command = [sys.executable, "-c", FAKE_SERVER]
+        return service
+
+    services.ChromeDevToolsService = fake_service  # type: ignore[assignment]
+    browser = services.DevToolsBrowserService(out_dir=Path(tempfile.mkdtemp()))
+
+    async def capture() -> int:
+        shots, _ = await browser.render_and_capture("<p>hi</p>")
+        if len(shots) != 1:
+            raise AssertionError(f"expected one screenshot, got {shots!r}")
+        client = browser._idle[-1]._client
+        return client._proc.pid  # type: ignore[union-attr]
+
+    first_pid = asyncio.run(capture())
+    second_pid = asyncio.run(capture())
+    leaked = not _process_gone(first_pid)
+    # The second run's loop is gone too; clean up its warm session the same way.
+    for service in browser._idle:
+        service.kill()
+
+    if first_pid == second_pid:
+        return False, "second loop reused a session from the finished loop"
+    if leaked:
+        return False, f"MCP server {first_pid} from the finished loop is still running"
+    return True, "idle sessions from a finished loop are killed, not leaked"
+
+
+def main() -> int:
+    ok, info = test_loop_change_kills_idle_sessions()
+    print(f"[ {'OK' if ok else 'FAIL'} ] DevTools session pool: {info}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,85 @@
+"""Concurrent Chrome DevTools calls over one MCP stdio session (fake server, no Chrome)."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+from typing import Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+# Minimal stdio MCP server: Content-Length framed requests in, newline-delimited JSON out.
+# Each reply is delayed so concurrent callers really overlap on the client side.
+FAKE_SERVER = r'''
+import json, sys, time
+stdin = sys.stdin.buffer
+while True:
+    line = stdin.readline()
+    if not line:
+        break
+    if not line.strip():
+        continue
+    length = int(line.split(b":", 1)[1])
+    while stdin.readline().strip():
+        pass
+    msg = json.loads(stdin.read(length))
+    if "id" not in msg:
+        continue
+    name = (msg.get("params") or {}).get("name")
+    if name == "take_screenshot":
+        result = {"content": [{"type": "image", "mimeType": "image/png", "data": "ZmFrZQ=="}]}
+    elif name == "evaluate_script":
+        result = {"content": [{"type": "text", "text": json.dumps([{"level": "log", "message": "hi"}])}]}
+    else:
+        result = {}
+    time.sleep(0.05)
+    sys.stdout.write(json.dumps({"jsonrpc": "2.0", "id": msg["id"], "result": result}) + "\n")
+    sys.stdout.flush()
+'''
+
+
+async def test_parallel_observe_calls() -> Tuple[bool, str]:
+    from src.chrome_devtools_service import ChromeDevToolsService
+
+    service = ChromeDevToolsService(enabled=False)
+    service.enabled = True
+    service._command = [sys.executable, "-c", FAKE_SERVER]
+    client = None
+    try:
+        # Warm up so both parallel calls share the already-started session.
+        await service.get_console_messages_mcp()
+        client = service._client
+        shot, logs, shot2, logs2 = await asyncio.wait_for(
+            asyncio.gather(
+                service.take_screenshot_mcp(wait_ready=False),
+                service.get_console_messages_mcp(),
+                service.take_screenshot_mcp(wait_ready=False),
+                service.get_console_messages_mcp(),
+            ),
+            timeout=10,
+        )
+    except Exception as exc:
+        return False, f"parallel calls failed: {exc!r}"
+    finally:
+        restarted = client is None or service._client is not client
+        await service.aclose()
+    if restarted:
+        return False, "MCP session was restarted during parallel calls"
+    if not (shot == shot2 == "data:image/png;base64,ZmFrZQ=="):
+        return False, f"unexpected screenshots: {shot!r} {shot2!r}"
+    if logs != [{"level": "log", "message": "hi"}] or logs2 != logs:
+        return False, f"unexpected console logs: {logs!r} {logs2!r}"
+    return True, "parallel screenshot + console calls share one MCP session"
+
+
+async def main() -> int:
+    ok, info = await test_parallel_observe_calls()
+    print(f"[ {'OK' if ok else 'FAIL'} ] MCP client concurrency: {info}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
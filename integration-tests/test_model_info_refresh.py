@@ -0,0 +1,77 @@
+"""get_model_info refreshes an expired catalog and keeps serving it if a refresh fails (no network)."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+os.environ.setdefault("OPENROUTER_DISABLE_RETRY", "1")
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+async def test_model_info_refresh() -> Tuple[bool, str]:
+    from src import or_client
+
+    fetches = 0
+    fail = False
+
+    def model(params: Tuple[str, ...]) -> "or_client.ModelInfo":
+        return or_client.ModelInfo(
+            id="test/model",
+            name="Test Model",
+            has_text_input=True,
+            has_image_input=False,
+            prompt_price=0.0,
+            completion_price=0.0,
+            created=0,
+            supported_parameters=params,
+        )
+
+    async def fake_fetch() -> List["or_client.ModelInfo"]:
+        nonlocal fetches
+        fetches += 1
+        if fail:
+            raise RuntimeError("catalog unavailable")
+        info = model(("tools",) if fetches > 1 else ())
+        or_client._MODEL_INDEX[info.id] = info
+        return [info]
+
+    def expire() -> None:
+        or_client._CACHE_TIMESTAMP -= or_client._CACHE_DURATION + 1
+
+    or_client._fetch_all_models = fake_fetch  # type: ignore[assignment]
+
+    info = await or_client.get_model_info("test/model")
+    await or_client.get_model_info("test/model")
+    if fetches != 1 or info is None or info.supported_parameters != ():
+        return False, f"cold lookup should fetch once, got {fetches} fetches"
+
+    expire()
+    info = await or_client.get_model_info("test/model")
+    if fetches != 2 or info is None or info.supported_parameters != ("tools",):
+        return False, "expired catalog was not refreshed on lookup"
+
+    expire()
+    fail = True
+    info = await or_client.get_model_info("test/model")
+    if info is None or info.supported_parameters != ("tools",):
+        return False, "failed refresh should keep serving the existing index"
+    if await or_client.get_model_info("test/unknown") is not None:
+        return False, "unknown slug should return None"
+    return True, "expired catalog refetched; failed refresh keeps the last index"
+
+
+async def main() -> int:
+    ok, info = await test_model_info_refresh()
+    print(f"[ {'OK' if ok else 'FAIL'} ] Model info refresh: {info}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
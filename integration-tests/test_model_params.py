@@ -35,6 +35,7 @@ async def test_param_application() -> Tuple[bool, str]:
     tmp = tempfile.NamedTemporaryFile(prefix="model_params_", suffix=".json", delete=False)
     os.environ["MODEL_PARAMS_PATH"] = tmp.name
     from src import model_params as mp
+    mp._effective_path.cache_clear()
 
     cfg = app_config.get_config()
 
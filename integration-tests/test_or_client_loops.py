@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+from typing import Tuple
+
+os.environ.setdefault("OPENROUTER_DISABLE_RETRY", "1")
+os.environ.setdefault("OPENROUTER_API_KEY", "test-key")
+os.environ.setdefault("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def test_client_per_loop() -> Tuple[bool, str]:
+    from src import or_client
+
+    async def build_twice():
+        first = or_client._client()
+        second = or_client._client()
+        await or_client.aclose()
+        return first, second
+
+    clients = []
+    for _ in range(2):
+        # A fresh loop each time: the first _client() on a loop builds and caches it.
+        first, second = asyncio.run(asyncio.wait_for(build_twice(), timeout=5))
+        if first is not second:
+            return False, "second _client() on the same loop built a new client"
+        clients.append(first)
+    if clients[0] is clients[1]:
+        return False, "client was shared across event loops"
+    return True, "one client per loop, built without deadlock"
+
+
+def main() -> int:
+    ok, info = test_client_per_loop()
+    print(f"[ {'OK' if ok else 'FAIL'} ] or_client per-loop clients: {info}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
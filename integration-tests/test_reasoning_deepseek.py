@@ -43,6 +43,7 @@ async def test_deepseek_reasoning_vs_plain() -> Tuple[bool, str]:
     os.environ["MODEL_PARAMS_PATH"] = tmp.name
 
     from src import model_params as mp
+    mp._effective_path.cache_clear()
 
     cfg = app_config.get_config()
     preferred_slugs = [
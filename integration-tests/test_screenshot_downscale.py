@@ -188,11 +188,29 @@ async def test_screenshot_downscale_used_by_llm_contexts() -> Tuple[bool, str]:
     return True, "downscaled screenshots used by vision only; code prompt omitted images"
 
 
+def test_literal_strings_encode_as_text() -> Tuple[bool, str]:
+    inject_src()
+    from src import or_client
+
+    # Strings that cannot be file names are literal content, not path errors.
+    for literal in ("abc\x00def", "x" * 5000, "missing/shot.png"):
+        try:
+            url = or_client.encode_image_to_data_url(literal)
+        except Exception as exc:
+            return False, f"{literal[:16]!r} raised {exc!r}"
+        header, payload = url.split(",", 1)
+        if header != "data:text/plain;base64" or base64.b64decode(payload).decode("utf-8") != literal:
+            return False, f"{literal[:16]!r} encoded as {url[:40]!r}"
+    return True, "NUL-byte, over-long and missing-path strings encode as text/plain"
+
+
 async def main() -> int:
     ok, info = await test_screenshot_downscale_used_by_llm_contexts()
     status = "OK" if ok else "FAIL"
     print(f"[ {status} ] Screenshot downscale: {info}")
-    return 0 if ok else 1
+    literal_ok, literal_info = test_literal_strings_encode_as_text()
+    print(f"[ {'OK' if literal_ok else 'FAIL'} ] Literal data URL fallback: {literal_info}")
+    return 0 if ok and literal_ok else 1
 
 
 if __name__ == "__main__":
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import asyncio
+import base64
 import json
 import logging
 import time
@@ -83,10 +84,30 @@ class ChromeDevToolsService:
         ok = bool(result) if isinstance(result, bool) else True
         return {"ok": ok, "duration_ms": duration_ms}
 
-    async def take_screenshot_mcp(self) -> Optional[str]:
+    async def reset_page_mcp(self) -> None:
+        """Navigate to about:blank so the next load_html_mcp starts from a fresh document."""
+        result = await self._call_tool("navigate_page", {"type": "url", "url": "about:blank"})
+        if isinstance(result, dict) and result.get("isError"):
+            raise RuntimeError(f"navigate_page failed: {self._extract_field(result, 'content')}")
+
+    async def take_screenshot_mcp(self, *, wait_ready: bool = True) -> Optional[str]:
+        """Capture the page as a data URL; wait_ready=False skips the settle wait for a page known to be settled."""
+        shot = await self._take_screenshot_part(wait_ready)
+        if shot is None:
+            return None
+        mime, data = shot
+        return f"data:{mime};base64,{data}"
+
+    async def take_screenshot_bytes_mcp(self, *, wait_ready: bool = True) -> Optional[bytes]:
+        """Capture the page as decoded image bytes, skipping the data-URL round trip."""
+        shot = await self._take_screenshot_part(wait_ready)
+        return base64.b64decode(shot[1]) if shot is not None else None
+
+    async def _take_screenshot_part(self, wait_ready: bool) -> Optional[tuple[str, str]]:
         if not self.enabled:
             return None
-        await self._wait_for_page_ready()
+        if wait_ready:
+            await self._wait_for_page_ready()
         result = await self._call_tool("take_screenshot")
         image = self._extract_field(result, "content")
         if isinstance(image, list):
@@ -94,8 +115,7 @@ class ChromeDevToolsService:
                 if isinstance(part, dict) and part.get("type") == "image":
                     data = part.get("data")
                     if isinstance(data, str) and data:
-                        mime = part.get("mimeType", "image/png")
-                        return f"data:{mime};base64,{data}"
+                        return part.get("mimeType", "image/png"), data
         return None
 
     async def get_console_messages_mcp(self, level: Optional[str] = None) -> List[Dict[str, Any]]:
@@ -216,19 +236,14 @@ class ChromeDevToolsService:
             "    const maybeDone = () => { if (loadDone && renderDone) { settle(); } };"
             "    if (renderDone && loadDone) { settle(); return; }"
             "    const observer = new MutationObserver(() => {"
-            "      if (renderDone) { return; }"
+            "      if (renderDone) { observer.disconnect(); return; }"
             "      renderDone = hasRenderableDom();"
             "      maybeDone();"
             "    });"
-            "    observer.observe(document.documentElement || document, { childList: true, subtree: true });"
+            # Observing the document itself also sees a replaced documentElement, so no polling is needed.
+            "    observer.observe(document, { childList: true, subtree: true });"
             "    window.addEventListener('load', () => { loadDone = true; maybeDone(); }, { once: true });"
-            "    const poll = setInterval(() => {"
-            "      if (renderDone) { return; }"
-            "      renderDone = hasRenderableDom();"
-            "      maybeDone();"
-            "    }, 50);"
             "    setTimeout(() => {"
-            "      clearInterval(poll);"
             "      observer.disconnect();"
             "      settle();"
             "    }, timeoutMs);"
@@ -343,6 +358,13 @@ class ChromeDevToolsService:
     async def aclose(self) -> None:
         await self._close_client()
 
+    def kill(self) -> None:
+        """Kill the MCP server (and its Chrome) synchronously, for sessions whose event loop is gone."""
+        client = self._client
+        self._client = None
+        if client is not None:
+            client.kill()
+
     async def _call_tool(self, name: str, arguments: Optional[Dict[str, Any]] = None) -> Any:
         last_exc: Exception | None = None
         timeout = max(5.0, float(self.call_timeout))
@@ -109,7 +109,8 @@ def get_config() -> AppConfig:
             return
         if value <= 0:
             return
-        slug_key = str(slug)
+        # Lower-case once here so get_image_limit() is a single dict probe per lookup.
+        slug_key = str(slug).strip().lower()
         if slug_key in limits:
             limits[slug_key] = min(limits[slug_key], value)
         else:
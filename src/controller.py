@@ -49,6 +49,7 @@ class InterpretationResult:
 
 _DOUBLE_BRACE_PATTERN = re.compile(r"\{\{([A-Z0-9_]+)\}\}")
 _SINGLE_BRACE_PATTERN = re.compile(r"\{([A-Z0-9_]+)\}")
+_KEY_SEPARATOR_PATTERN = re.compile(r"[^A-Za-z0-9]+")
 _TEXT_MIME_PREFIXES = ("text/",)
 _TEXT_MIME_EXACT = {
     "application/json",
@@ -610,12 +611,11 @@ async def _detect_code_model_image_support(models: Sequence[str]) -> Dict[str, b
     normalized = [slug.strip() for slug in models if slug.strip()]
     if not normalized:
         return {}
-    try:
-        available = await orc.list_models(vision_only=True, limit=2000, force_refresh=False)
-    except Exception:
-        available = []
-    image_ids = {getattr(m, "id", "") for m in available}
-    return {slug: slug in image_ids for slug in normalized}
+    result: Dict[str, bool] = {}
+    for slug in normalized:
+        info = await orc.get_model_info(slug)
+        result[slug] = bool(info and info.has_image_input)
+    return result
 
 
 class IterationController:
@@ -640,7 +640,7 @@ class IterationController:
     def normalize_template_key(self, raw_key: str) -> str:
         if raw_key is None:
             raise ValueError("Template variable key is required")
-        cleaned = re.sub(r"[^A-Za-z0-9]+", "_", str(raw_key)).strip("_").upper()
+        cleaned = _KEY_SEPARATOR_PATTERN.sub("_", str(raw_key)).strip("_").upper()
         if not cleaned:
             raise ValueError("Template variable key must contain letters or numbers")
         if len(cleaned) > 120:
@@ -773,11 +773,14 @@ class IterationController:
             if output is None:
                 continue
 
-            snapshot = list(output.messages or [])
+            # Read-only here, so the stored list is used as-is rather than copied per node
+            snapshot = output.messages or ()
             if snapshot:
                 prefix_len = 0
                 max_compare = min(len(history), len(snapshot))
-                while prefix_len < max_compare and history[prefix_len] == snapshot[prefix_len]:
+                while prefix_len < max_compare and (
+                    history[prefix_len] is snapshot[prefix_len] or history[prefix_len] == snapshot[prefix_len]
+                ):
                     prefix_len += 1
                 if prefix_len < len(snapshot):
                     history.extend(snapshot[prefix_len:])
@@ -16,6 +16,7 @@ from .services import (
 )
 from .view import NiceGUIView
 from .logging import start_auto_logger
+from . import or_client
 
 
 def _auto_logger_enabled() -> bool:
@@ -68,6 +69,9 @@ def create_app() -> NiceGUIView:
     controller = IterationController(ai_service, browser_service, vision_service)
     view = NiceGUIView(controller)
     view.render()
+    # Release the pooled OpenRouter connections and warm browser sessions when the server stops.
+    app.on_shutdown(or_client.aclose)
+    app.on_shutdown(browser_service.aclose)
     if _auto_logger_enabled():
         start_auto_logger()
     return view
@@ -41,6 +41,8 @@ class MCPClient:
         self._request_id = 0
         self._initialized = False
         self._lock = asyncio.Lock()
+        # One request in flight at a time: replies are read off a single shared stream.
+        self._rpc_lock = asyncio.Lock()
 
     async def start(self) -> None:
         async with self._lock:
@@ -71,6 +73,21 @@ class MCPClient:
         await self.start()
         return await self._rpc_call(method, params or {})
 
+    def kill(self) -> None:
+        """Kill the server's process group without awaiting it; usable after the owning loop has ended."""
+        proc = self._proc
+        self._proc = None
+        self._reader = None
+        self._writer = None
+        self._initialized = False
+        if proc is None or proc.returncode is not None:
+            return
+        try:
+            os.killpg(os.getpgid(proc.pid), signal.SIGKILL)
+        except Exception:
+            with contextlib.suppress(Exception):
+                os.kill(proc.pid, signal.SIGKILL)
+
     async def close(self) -> None:
         proc = self._proc
         if not proc:
@@ -147,25 +164,26 @@ class MCPClient:
     ) -> Any:
         if expect_initialized and not self._initialized:
             raise RuntimeError("MCP client not initialized")
-        self._request_id += 1
-        req_id = self._request_id
-        payload = {
-            "jsonrpc": "2.0",
-            "id": req_id,
-            "method": method,
-            "params": params,
-        }
-        await self._send(payload)
-        while True:
-            message = await self._read_message()
-            if message is None:
-                raise RuntimeError("MCP server closed connection")
-            if message.get("id") != req_id:
-                self._handle_notification(message)
-                continue
-            if "error" in message:
-                raise RuntimeError(str(message["error"]))
-            return message.get("result")
+        async with self._rpc_lock:
+            self._request_id += 1
+            req_id = self._request_id
+            payload = {
+                "jsonrpc": "2.0",
+                "id": req_id,
+                "method": method,
+                "params": params,
+            }
+            await self._send(payload)
+            while True:
+                message = await self._read_message()
+                if message is None:
+                    raise RuntimeError("MCP server closed connection")
+                if message.get("id") != req_id:
+                    self._handle_notification(message)
+                    continue
+                if "error" in message:
+                    raise RuntimeError(str(message["error"]))
+                return message.get("result")
 
     async def _send(self, payload: Dict[str, Any]) -> None:
         if not self._writer:
@@ -26,17 +26,6 @@ def get_input_screenshot_interval() -> float:
 
 
 def get_image_limit(model_slug: str) -> Optional[int]:
-    limits: Dict[str, int] = getattr(get_config(), "model_image_limits", {}) or {}
-    if not isinstance(limits, dict):
-        return None
-    try:
-        value = limits.get(model_slug)
-    except Exception:
-        return None
-    if value is None:
-        return None
-    try:
-        parsed = int(value)
-    except Exception:
-        return None
-    return parsed if parsed > 0 else None
+    # Keys are lower-cased and values validated (positive ints) in config.get_config().
+    limits: Dict[str, int] = get_config().model_image_limits
+    return limits.get((model_slug or "").strip().lower())
@@ -1,21 +1,22 @@
 from __future__ import annotations
 
+from functools import lru_cache
 import json
 import os
+import sys
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Dict, Sequence
+
+import orjson
 
 
 # Store parameters in project root so they can be versioned/shared.
 _DEFAULT_PATH = (Path(__file__).resolve().parents[1] / "model_params.json").resolve()
 
-def _path() -> Path:
-    custom = os.getenv("MODEL_PARAMS_PATH", "").strip() if 'os' in globals() else ""
-    if custom:
-        return Path(custom).expanduser().resolve()
-    return _DEFAULT_PATH
 
+@lru_cache(maxsize=1)
 def _effective_path() -> Path:
+    # Resolved once per process; call _effective_path.cache_clear() after changing MODEL_PARAMS_PATH.
     env_path = os.getenv("MODEL_PARAMS_PATH", "").strip()
     if env_path:
         try:
@@ -25,16 +26,38 @@ def _effective_path() -> Path:
     return _DEFAULT_PATH
 
 
+# Last parsed file, keyed by (path, mtime_ns, size). Every chat turn reads params, and for
+# most models there are none; a stat() is enough to tell the file has not changed.
+_READ_CACHE: tuple[tuple[Path, int, int], Dict[str, Dict[str, str]]] | None = None
+
+
 def _read_all() -> Dict[str, Dict[str, str]]:
+    """Return a fresh outer dict; callers may add or drop slugs but must not edit inner dicts."""
+    global _READ_CACHE
+    p = _effective_path()
     try:
-        raw = _effective_path().read_text(encoding="utf-8")
+        st = p.stat()
+    except OSError:
+        return {}
+    key = (p, st.st_mtime_ns, st.st_size)
+    cached = _READ_CACHE
+    if cached is not None and cached[0] == key:
+        return dict(cached[1])
+    out = _parse_file(p)
+    _READ_CACHE = (key, out)
+    return dict(out)
+
+
+def _parse_file(p: Path) -> Dict[str, Dict[str, str]]:
+    try:
+        raw = p.read_text(encoding="utf-8")
         data = json.loads(raw)
         if isinstance(data, dict):
             # Ensure { model_slug: {param: str} }
             out: Dict[str, Dict[str, str]] = {}
             for k, v in data.items():
                 if isinstance(v, dict):
-                    out[str(k)] = {str(pk): str(pv) for pk, pv in v.items() if isinstance(pk, str)}
+                    out[sys.intern(str(k))] = {sys.intern(pk): str(pv) for pk, pv in v.items() if isinstance(pk, str)}
             return out
         return {}
     except Exception:
@@ -45,7 +68,16 @@ def _write_all(data: Dict[str, Dict[str, str]]) -> None:
     try:
         p = _effective_path()
         p.parent.mkdir(parents=True, exist_ok=True)
-        p.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        # Write a sibling temp file and swap it in so readers never see a partial file.
+        tmp = p.with_name(p.name + ".tmp")
+        # One small whole-file payload: skip the buffered layer and hand the bytes straight to the OS.
+        # Raw writes may be short, so loop until every byte is down before swapping the file in.
+        remaining = memoryview(payload)
+        with open(tmp, "wb", buffering=0) as fh:
+            while remaining:
+                remaining = remaining[fh.write(remaining):]
+        os.replace(tmp, p)
     except Exception:
         # Best-effort persistence only
         pass
@@ -70,14 +102,17 @@ def set_params(slug: str, params: Dict[str, str]) -> None:
     _write_all(data)
 
 
-def get_sanitized_params_for_api(slug: str, supported: list[str] | None) -> Dict[str, Any]:
+def get_sanitized_params_for_api(slug: str, supported: Sequence[str] | None) -> Dict[str, Any]:
     """Return params filtered to supported keys and converted from strings.
 
     Conversion strategy:
     - Try JSON parse for numbers/bools/arrays/objects
     - Fallback to original string
     """
-    raw = get_params(slug)
+    raw = _read_all().get(slug)
+    if not raw:
+        # Common case: nothing stored for this model
+        return {}
     out: Dict[str, Any] = {}
     # If supported is falsy/unknown, do NOT filter; pass through all keys.
     supported_set = None if not supported else {s.lower() for s in supported}
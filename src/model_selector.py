@@ -1,9 +1,13 @@
 # src/model_selector.py
 from __future__ import annotations
 
-from typing import Callable, Dict, List, Optional, Set
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
 import asyncio
 import datetime
+import sys
+import time
 
 from nicegui import ui
 from . import op_status
@@ -11,6 +15,53 @@ from .params_dialog import open_params_dialog
 from . import or_client as orc
 
 
+# Quiet period after the last filter keystroke before the model list is reloaded.
+# The browser debounces model-value updates first (_FILTER_CLIENT_DEBOUNCE_MS), so bursts
+# of keystrokes reach the server as a single event; the server-side delay coalesces the rest.
+_FILTER_CLIENT_DEBOUNCE_MS = 250
+_FILTER_DEBOUNCE_S = 0.12
+
+# Selection toggles within this window are applied (chips, input value, on_change) once.
+_APPLY_BATCH_S = 0.05
+
+# How long a fetched model catalog is filtered locally before or_client is asked again.
+_CATALOG_TTL_S = 600.0
+
+# Rows are windowed: only the rows inside the 360px scroll viewport plus an overscan
+# margin on each side are materialized; spacers stand in for the rest. Rows have a
+# fixed height so scroll offsets map directly to model indices.
+_ROW_HEIGHT_PX = 44
+_VIEWPORT_PX = 360
+_OVERSCAN_ROWS = 6
+_WINDOW_ROWS = -(-_VIEWPORT_PX // _ROW_HEIGHT_PX) + 2 * _OVERSCAN_ROWS
+
+
+def _format_date(timestamp: int) -> str:
+    try:
+        if timestamp == 0:
+            return 'N/A'
+        dt = datetime.datetime.fromtimestamp(timestamp)
+        return dt.strftime('%m/%d/%y')
+    except Exception:
+        return 'N/A'
+
+
+@dataclass
+class _RowHandles:
+    """Widgets of one pooled dropdown row; model_id/model_index track the model currently shown."""
+    row: ui.element
+    checkbox: ui.element
+    name_label: ui.label
+    id_label: ui.label
+    text_icon: ui.icon
+    image_icon: ui.icon
+    tool_icon: ui.icon
+    price_label: ui.label
+    created_label: ui.label
+    model_id: str = ''
+    model_index: int = -1
+
+
 class ModelSelector:
     """
     Interactive, dropdown-style multi-select for OpenRouter models.
@@ -18,10 +69,10 @@ class ModelSelector:
     - Read-only input toggles a dropdown below it
     - Multi-select by default; comma-separated slugs (model.id) displayed in input
     - Shows error message when no models are selected
-    - Scrollable grid (~10 rows) with:
+    - Scrollable, windowed grid (~8 rows visible; only the visible window is rendered) with:
       * first column checkbox (or radio button if single_selection=True)
       * columns: name (with secondary id line), has_text_input, has_image_input, prompt_price, completion_price
-    - Live filtering via or_client.list_models(query=...) on each keystroke
+    - Live filtering via or_client.list_models(query=...), debounced while typing
     - Keyboard navigation: ArrowUp/ArrowDown to change focus, Space to toggle,
       Enter to apply & close, Escape to cancel & close
     - Exposes get_value()/set_value(); on_change called when selection is applied
@@ -45,11 +96,40 @@ class ModelSelector:
         self.single_selection = single_selection
         self.require_image_input = require_image_input
 
-        self._selected_ids: Set[str] = self._parse_value(initial_value)
-        self._applied_value: str = self._format_value(sorted(self._selected_ids))
+        # Selection is an immutable set replaced via _mutate_selection(); the sorted list is
+        # patched incrementally on add/remove and the formatted value is memoized until the
+        # next mutation.
+        self._selected_ids: FrozenSet[str] = frozenset()
+        self._selected_sorted: Optional[List[str]] = None
+        self._selected_value: Optional[str] = None
+        self._mutate_selection(replace=self._parse_value(initial_value))
+        self._applied_value: str = self._selection_value()
         self._models: List[orc.ModelInfo] = []
         self._focused_index: int = -1
-        self._row_entries: List[Dict[str, object]] = []
+        self._row_pool: List[_RowHandles] = []
+        # Element id -> pooled row for the row, its checkbox and its params button, so one
+        # bound handler per event type can serve every row via e.sender.
+        self._row_by_sender: Dict[int, _RowHandles] = {}
+        # Index into _models of the first pooled row, and how many pooled rows are in use.
+        self._window_start: int = 0
+        self._window_count: int = 0
+        # model id -> pooled row currently showing it (rendered window only).
+        self._row_by_mid: Dict[str, _RowHandles] = {}
+        self._chip_widgets: Dict[str, ui.element] = {}
+        # Selection the chips currently reflect; None forces the first render.
+        self._chips_selection: Optional[FrozenSet[str]] = None
+        self._filter_task: Optional[asyncio.Task] = None
+        self._apply_pending: bool = False
+        # Unfiltered availability from the last or_client fetch (and when it was fetched)
+        # and the query shown in _models.
+        self._all_models: Optional[List[orc.ModelInfo]] = None
+        self._catalog_fetched_at: float = 0.0
+        # Bumped by every _load_and_render; a load that awaited a fetch drops its result if a
+        # newer load started meanwhile, so only the latest query reaches _render_rows.
+        self._load_seq: int = 0
+        # model id -> (created date label, supports tool calls), computed once per catalog fetch.
+        self._row_display: Dict[str, Tuple[str, bool]] = {}
+        self._last_query_lc: str = ''
         self._tool_param_keys: Set[str] = {'tools', 'function_calling', 'tool_choice', 'parallel_tool_calls'}
 
         with ui.column().classes('w-full gap-1') as root:
@@ -74,9 +154,9 @@ class ModelSelector:
                     label='Filter models',
                     placeholder='type to filter (by name or id)...',
                     value='',
-                ).classes('w-full').props('dense clearable')
-                self._filter.on('input', self._on_filter_input)
-                self._filter.on('keyup', self._on_filter_keyup)
+                ).classes('w-full').props(f'dense clearable debounce={_FILTER_CLIENT_DEBOUNCE_MS}')
+                # Only the (client-debounced) model-value update drives filtering; it also covers
+                # the clear button. The raw 'input' DOM event would bypass the debounce.
                 self._filter.on('update:model-value', self._on_filter_input)
                 self._filter.on('keydown', self._on_filter_key)
 
@@ -100,9 +180,12 @@ class ModelSelector:
                     ui.label('Pricing ($/M)').classes('text-center')
                     ui.label('Created').classes('text-center')
 
-                with ui.element('div').classes('w-full max-h-[360px] overflow-auto') as scroll:
+                with ui.element('div').classes('w-full overflow-auto').style(f'max-height: {_VIEWPORT_PX}px;') as scroll:
                     self._scroll = scroll
+                    self._top_spacer = ui.element('div').classes('w-full').style('height: 0px;')
                     self._rows_container = ui.column().classes('w-full gap-0')
+                    self._bottom_spacer = ui.element('div').classes('w-full').style('height: 0px;')
+                self._scroll.on('scroll', self._on_scroll, js_handler='(e) => emit(e.target.scrollTop)', throttle=0.05)
 
         ui.timer(0.05, lambda: asyncio.create_task(self._load_and_render('')), once=True)
         # Initial chips render
@@ -111,27 +194,42 @@ class ModelSelector:
     # --- Public API ---
 
     def get_value(self) -> str:
-        return self._format_value(sorted(self._selected_ids))
+        return self._selection_value()
 
     def set_value(self, value: str) -> None:
-        self._selected_ids = self._parse_value(value)
-        self._applied_value = self._format_value(sorted(self._selected_ids))
+        self._mutate_selection(replace=self._parse_value(value))
+        self._applied_value = self._selection_value()
         self._set_input_value(self._applied_value)
         self._render_chips()
         try:
-            self._render_rows()
+            # The model list is unchanged; only the checked state of visible rows can differ.
+            self._sync_checkboxes()
         except Exception:
             pass
 
+    def refresh(self) -> None:
+        """Drop the locally cached catalog so the next filter reloads it from or_client."""
+        self._all_models = None
+
     # --- Events ---
 
     async def _on_filter_input(self, e) -> None:
+        # Trailing-edge debounce: coalesce filter updates into a single reload once input settles.
+        self._cancel_pending_filter()
         query = (self._filter.value or '').strip()
+        self._filter_task = asyncio.create_task(self._debounced_filter(query))
+
+    async def _debounced_filter(self, query: str) -> None:
+        await asyncio.sleep(_FILTER_DEBOUNCE_S)
+        if query != (self._filter.value or '').strip():
+            return
         await self._load_and_render(query)
 
-    async def _on_filter_keyup(self, e) -> None:
-        # Mirror input handler to ensure realtime filtering regardless of browser/event quirk
-        await self._on_filter_input(e)
+    def _cancel_pending_filter(self) -> None:
+        task = self._filter_task
+        if task is not None and not task.done():
+            task.cancel()
+        self._filter_task = None
 
     async def _on_filter_key(self, e) -> None:
         key = ''
@@ -149,19 +247,48 @@ class ModelSelector:
         elif key in (' ', 'Spacebar', 'Space'):
             self._toggle_focused_selection()
         elif key in ('Enter', 'NumpadEnter'):
-            await self._apply_immediately()
+            # Explicit apply: flush now rather than waiting for the batch timer.
+            self._apply_pending = False
+            self._do_apply()
         elif key in ('Escape', 'Esc'):
             # Clear filter and reload full list
+            self._cancel_pending_filter()
             try:
                 self._filter.value = ''
             except Exception:
                 pass
             await self._load_and_render('')
 
+    def _on_scroll(self, e) -> None:
+        try:
+            scroll_top = float(e.args[0] if isinstance(e.args, (list, tuple)) else e.args)
+        except Exception:
+            return
+        start = max(0, int(scroll_top // _ROW_HEIGHT_PX) - _OVERSCAN_ROWS)
+        if start != self._window_start:
+            self._window_start = start
+            self._render_rows()
+
     # --- Apply / Cancel ---
 
     async def _apply_immediately(self) -> None:
-        new_value = self._format_value(sorted(self._selected_ids))
+        # Toggles arrive in bursts (rapid clicks, chip removals); coalesce everything within
+        # _APPLY_BATCH_S into one apply so chips and on_change run once per burst.
+        if self._apply_pending:
+            return
+        self._apply_pending = True
+        # Callers may run in detached tasks without a slot context; anchor the timer to root.
+        with self.root:
+            ui.timer(_APPLY_BATCH_S, self._flush_apply, once=True)
+
+    def _flush_apply(self) -> None:
+        if not self._apply_pending:
+            return
+        self._apply_pending = False
+        self._do_apply()
+
+    def _do_apply(self) -> None:
+        new_value = self._selection_value()
         self._applied_value = new_value
         self._set_input_value(new_value)
         self._render_chips()
@@ -172,46 +299,81 @@ class ModelSelector:
                 pass
 
     def _apply_new_selection(self, new_ids: Set[str]) -> None:
-        self._selected_ids = set(new_ids)
+        self._mutate_selection(replace=new_ids)
         asyncio.create_task(self._apply_immediately())
 
     # --- Load and render ---
 
     async def _load_and_render(self, query: str) -> None:
         removed: Set[str] = set()
+        query_lc = query.strip().lower()
+        self._load_seq += 1
+        seq = self._load_seq
         try:
-            # Load models for current view (respecting query and capability constraints)
-            models = await orc.list_models(query=query, vision_only=self.vision_only, limit=2000)
-            filtered = list(models)
-            if self.require_image_input:
-                filtered = [m for m in filtered if getattr(m, 'has_image_input', False)]
-
-            # Determine removal only against the unfiltered availability under capability constraints,
-            # so typing in the filter does NOT clear existing selections.
-            all_models = await orc.list_models(query="", vision_only=self.vision_only, limit=2000)
-            if self.require_image_input:
-                all_models = [m for m in all_models if getattr(m, 'has_image_input', False)]
-            available_ids_all = {m.id for m in all_models}
-            for sid in list(self._selected_ids):
-                if sid not in available_ids_all:
-                    removed.add(sid)
-
-            self._models = filtered
+            # While the catalog is fresh every query is answered locally; refining the previous
+            # query (e.g. "gpt" -> "gpt-4") can only narrow the result, so it filters the rows
+            # already on screen rather than the whole catalog.
+            fresh = (
+                self._all_models is not None
+                and time.monotonic() - self._catalog_fetched_at < _CATALOG_TTL_S
+            )
+            if fresh and query_lc.startswith(self._last_query_lc):
+                source = self._models
+            elif fresh:
+                source = self._all_models
+            else:
+                # Load the unfiltered availability under capability constraints
+                all_models = await orc.list_models(query="", vision_only=self.vision_only, limit=2000)
+                if seq != self._load_seq:
+                    return
+                if self.require_image_input:
+                    all_models = [m for m in all_models if getattr(m, 'has_image_input', False)]
+                self._all_models = all_models
+                self._catalog_fetched_at = time.monotonic()
+                supports_tools = self._supports_tool_calls
+                self._row_display = {
+                    m.id: (_format_date(m.created), supports_tools(m)) for m in all_models
+                }
+                source = all_models
+
+                # Determine removal only against the unfiltered availability,
+                # so typing in the filter does NOT clear existing selections.
+                available_ids_all = {m.id for m in all_models}
+                for sid in self._selected_ids:
+                    if sid not in available_ids_all:
+                        removed.add(sid)
+
+            if query_lc:
+                self._models = [m for m in source if query_lc in m.search_key]
+            else:
+                self._models = list(source)
+            self._last_query_lc = query_lc
         except Exception as exc:
+            if seq != self._load_seq:
+                return
             op_status.enqueue_notification(f'Failed to load models: {exc}', color='negative', timeout=0, close_button=True)
             self._models = []
+            self._all_models = None
 
         if removed:
-            self._selected_ids.difference_update(removed)
+            self._mutate_selection(remove=removed)
             await self._apply_immediately()
 
         self._focused_index = 0 if self._models else -1
+        # A new result list starts at the top.
+        self._window_start = 0
+        try:
+            self._scroll.run_method('scrollTo', {'top': 0})
+        except Exception:
+            pass
         self._render_rows()
 
     def set_require_image_input(self, value: bool) -> None:
         if self.require_image_input == value:
             return
         self.require_image_input = value
+        # Capability constraints changed; the cached availability no longer applies.
+        self.refresh()
 
         async def _reload() -> None:
             try:
@@ -223,106 +385,209 @@ class ModelSelector:
         ui.timer(0, lambda: asyncio.create_task(_reload()), once=True)
 
     def _render_rows(self) -> None:
-        self._rows_container.clear()
-        self._row_entries.clear()
-
-        def format_price(prompt: float, completion: float) -> str:
-            try:
-                return f'${prompt:,.2f} / ${completion:,.2f}'
-            except Exception:
-                return '$0.00 / $0.00'
-        
-        def format_date(timestamp: int) -> str:
-            try:
-                if timestamp == 0:
-                    return 'N/A'
-                dt = datetime.datetime.fromtimestamp(timestamp)
-                return dt.strftime('%m/%d/%y')
-            except Exception:
-                return 'N/A'
+        # Rows are pooled and windowed: only the _WINDOW_ROWS rows around the scroll position
+        # exist as widgets, and they are rewritten in place when the window or list changes.
+        models = self._models
+        total = len(models)
+        count = min(total, _WINDOW_ROWS)
+        start = max(0, min(self._window_start, total - count))
+        self._window_start = start
+        self._window_count = count
+        pool = self._row_pool
+        while len(pool) < count:
+            pool.append(self._build_row())
+
+        # Capture per-render state once; the selection frozenset is never mutated in place.
+        selected = self._selected_ids
+        focused_index = self._focused_index
+        fill_row = self._fill_row
+        row_by_mid: Dict[str, _RowHandles] = {}
+        for slot in range(count):
+            idx = start + slot
+            m = models[idx]
+            handles = pool[slot]
+            handles.model_index = idx
+            fill_row(handles, m, checked=m.id in selected, focused=idx == focused_index)
+            handles.row.set_visibility(True)
+            row_by_mid[m.id] = handles
+        self._row_by_mid = row_by_mid
+        for handles in pool[count:]:
+            if handles.model_id:
+                handles.model_id = ''
+                handles.model_index = -1
+                handles.row.set_visibility(False)
+        self._top_spacer.style(f'height: {start * _ROW_HEIGHT_PX}px;')
+        self._bottom_spacer.style(f'height: {(total - start - count) * _ROW_HEIGHT_PX}px;')
+
+    def _sync_checkboxes(self) -> None:
+        # Selection-only update: rewrite checkbox/radio values without refilling the rows.
+        selected = self._selected_ids
+        single = self.single_selection
+        for handles in self._active_rows():
+            mid = handles.model_id
+            if single:
+                handles.checkbox.set_value(mid if mid in selected else None)
+            else:
+                handles.checkbox.set_value(mid in selected)
 
+    def _build_row(self) -> _RowHandles:
         with self._rows_container:
-            for idx, m in enumerate(self._models):
-                is_checked = m.id in self._selected_ids
-                row = ui.element('div').classes(
-                    'w-full px-2 py-1 rounded cursor-default hover:bg-gray-100 dark:hover:bg-gray-800'
-                ).style('display: grid; grid-template-columns: auto auto 2fr auto 1fr auto; gap: 0.5rem; align-items: center;')
-                if idx == self._focused_index:
-                    row.classes('bg-indigo-600/10')
-
-                with row:
-                    if self.single_selection:
-                        cb = ui.radio(value=m.id if is_checked else None, options={m.id: ''}).classes('justify-self-start self-start').props('dense')
-                    else:
-                        cb = ui.checkbox(value=is_checked).classes('justify-self-start self-start').props('dense')
-                    # Params button
-                    async def _open_params_handler(mid=m.id, title=m.id):
-                        await open_params_dialog(mid, title_name=title)
-                    ui.button('P', on_click=_open_params_handler).props('flat dense').classes('justify-self-start self-start').style('padding: 0; min-height: 20px; align-items: flex-start; margin-top: -2px;')
-                    with ui.column().classes('truncate gap-0'):
-                        ui.label(m.name).classes('text-sm truncate')
-                        ui.label(m.id).classes('text-[10px] text-gray-500 dark:text-gray-400 truncate')
-                    tool_capable = self._supports_tool_calls(m)
-                    with ui.row().classes('gap-1 justify-center'):
-                        ui.icon('check_circle' if m.has_text_input else 'cancel',
-                                color='green' if m.has_text_input else 'grey').classes('text-sm').props('aria-label="Text input capability"')
-                        ui.icon('check_circle' if m.has_image_input else 'cancel',
-                                color='green' if m.has_image_input else 'grey').classes('text-sm').props('aria-label="Vision input capability"')
-                        ui.icon('handyman',
-                                color='green' if tool_capable else 'grey').classes('text-sm').props('aria-label="Tool calling capability"')
-                    ui.label(format_price(m.prompt_price, m.completion_price)).classes('text-sm text-center')
-                    ui.label(format_date(m.created)).classes('text-sm text-center')
-
-                # Row click: focus only (no selection change)
-                row.on('click', lambda _, i=idx: self._set_focus(i))
-
-                # Checkbox/radio change: selection = checkbox.value or radio.value
-                async def _handle_cb_change(_=None, mid=m.id, cb_ref=cb):
-                    try:
-                        if self.single_selection:
-                            # Radio button: value is the selected option or None
-                            selected_value = getattr(cb_ref, 'value', None)
-                            if selected_value == mid:
-                                # Clear all selections and select only this one
-                                self._selected_ids.clear()
-                                self._selected_ids.add(mid)
-                                # Update all other radio buttons to be unselected
-                                for entry in self._row_entries:
-                                    other_cb = entry.get('checkbox')
-                                    other_id = entry.get('id')
-                                    if other_cb and other_id != mid:
-                                        try:
-                                            other_cb.value = None
-                                        except Exception:
-                                            pass
-                            else:
-                                # Deselect this one
-                                self._selected_ids.discard(mid)
-                        else:
-                            # Checkbox: value is boolean
-                            is_checked = bool(getattr(cb_ref, 'value', False))
-                            if is_checked:
-                                self._selected_ids.add(mid)
-                            else:
-                                self._selected_ids.discard(mid)
-                    except Exception:
-                        pass
-                    self._preview_selection_update()
-                    # Apply immediately so parent expansion header updates too
-                    await self._apply_immediately()
-
-                # Prefer dedicated value-change; fall back to generic events
-                wired = False
+            row = ui.element('div').classes(
+                'w-full px-2 py-1 rounded cursor-default hover:bg-gray-100 dark:hover:bg-gray-800 overflow-hidden'
+            ).style(
+                'display: grid; grid-template-columns: auto auto 2fr auto 1fr auto; gap: 0.5rem; align-items: center;'
+                f' height: {_ROW_HEIGHT_PX}px;'
+            )
+            with row:
+                if self.single_selection:
+                    cb = ui.radio(options={}, value=None).classes('justify-self-start self-start').props('dense')
+                else:
+                    cb = ui.checkbox(value=False).classes('justify-self-start self-start').props('dense')
+                params_btn = ui.button('P').props('flat dense').classes('justify-self-start self-start').style('padding: 0; min-height: 20px; align-items: flex-start; margin-top: -2px;')
+                with ui.column().classes('truncate gap-0'):
+                    name_label = ui.label('').classes('text-sm truncate')
+                    id_label = ui.label('').classes('text-[10px] text-gray-500 dark:text-gray-400 truncate')
+                with ui.row().classes('gap-1 justify-center'):
+                    text_icon = ui.icon('cancel', color='grey').classes('text-sm').props('aria-label="Text input capability"')
+                    image_icon = ui.icon('cancel', color='grey').classes('text-sm').props('aria-label="Vision input capability"')
+                    tool_icon = ui.icon('handyman', color='grey').classes('text-sm').props('aria-label="Tool calling capability"')
+                price_label = ui.label('').classes('text-sm text-center')
+                created_label = ui.label('').classes('text-sm text-center')
+
+        handles = _RowHandles(
+            row=row,
+            checkbox=cb,
+            name_label=name_label,
+            id_label=id_label,
+            text_icon=text_icon,
+            image_icon=image_icon,
+            tool_icon=tool_icon,
+            price_label=price_label,
+            created_label=created_label,
+        )
+
+        # Shared handlers resolve the row from e.sender and read model_id/model_index at call
+        # time, so they stay valid when the row is reused.
+        for element in (row, cb, params_btn):
+            self._row_by_sender[element.id] = handles
+        params_btn.on_click(self._on_params_click)
+
+        # Row click: focus only (no selection change)
+        row.on('click', self._on_row_click)
+
+        # Wire exactly one change source per row; multiple listeners would each schedule
+        # _handle_cb_change and fan a single click out into repeated applies.
+        try:
+            cb.on_value_change(self._on_row_value_change)
+        except Exception:
+            cb.on('update:model-value', self._on_row_value_change)
+        return handles
+
+    def _sender_row(self, e) -> Optional[_RowHandles]:
+        sender = getattr(e, 'sender', None)
+        return self._row_by_sender.get(sender.id) if sender is not None else None
+
+    async def _on_params_click(self, e) -> None:
+        handles = self._sender_row(e)
+        if handles is not None and handles.model_id:
+            await open_params_dialog(handles.model_id, title_name=handles.model_id)
+
+    def _on_row_click(self, e) -> None:
+        handles = self._sender_row(e)
+        if handles is not None and handles.model_index >= 0:
+            self._set_focus(handles.model_index)
+
+    def _on_row_value_change(self, e) -> None:
+        handles = self._sender_row(e)
+        if handles is not None:
+            asyncio.create_task(self._handle_cb_change(handles))
+
+    def _fill_row(self, handles: _RowHandles, m: orc.ModelInfo, *, checked: bool, focused: bool) -> None:
+        # Point the row at its new model before touching the checkbox so that the
+        # value-change handler sees a state that already matches the selection.
+        handles.model_id = m.id
+        if self.single_selection:
+            handles.checkbox.set_options({m.id: ''}, value=m.id if checked else None)
+        else:
+            handles.checkbox.set_value(checked)
+        handles.name_label.set_text(m.name)
+        handles.id_label.set_text(m.id)
+        handles.text_icon.set_name('check_circle' if m.has_text_input else 'cancel')
+        handles.text_icon.set_text_color('green' if m.has_text_input else 'grey')
+        handles.image_icon.set_name('check_circle' if m.has_image_input else 'cancel')
+        handles.image_icon.set_text_color('green' if m.has_image_input else 'grey')
+        created_str, supports_tools = self._display_for(m)
+        handles.tool_icon.set_text_color('green' if supports_tools else 'grey')
+        handles.price_label.set_text(m.price_str)
+        handles.created_label.set_text(created_str)
+        if focused:
+            handles.row.classes('bg-indigo-600/10')
+        else:
+            handles.row.classes(remove='bg-indigo-600/10')
+
+    async def _handle_cb_change(self, handles: _RowHandles) -> None:
+        # Checkbox/radio change: selection = checkbox.value or radio.value
+        mid = handles.model_id
+        if not mid:
+            return
+        cb_ref = handles.checkbox
+        try:
+            if self.single_selection:
+                # Radio button: value is the selected option or None
+                selected_value = getattr(cb_ref, 'value', None)
+                if selected_value == mid:
+                    if self._selected_ids == {mid}:
+                        return
+                    # Clear all selections and select only this one
+                    previous = self._selected_ids
+                    self._mutate_selection(replace=(mid,))
+                    # Only the previously selected radio (if rendered) needs unselecting
+                    self._clear_radios(previous, keep=handles)
+                else:
+                    if mid not in self._selected_ids:
+                        return
+                    # Deselect this one
+                    self._mutate_selection(remove=(mid,))
+            else:
+                # Checkbox: value is boolean
+                is_checked = bool(getattr(cb_ref, 'value', False))
+                if is_checked == (mid in self._selected_ids):
+                    return
+                if is_checked:
+                    self._mutate_selection(add=(mid,))
+                else:
+                    self._mutate_selection(remove=(mid,))
+        except Exception:
+            pass
+        self._preview_selection_update()
+        # Apply immediately so parent expansion header updates too
+        await self._apply_immediately()
+
+    def _clear_radios(self, mids: Iterable[str], *, keep: Optional[_RowHandles] = None) -> None:
+        row_by_mid = self._row_by_mid
+        for mid in mids:
+            other = row_by_mid.get(mid)
+            if other is not None and other is not keep:
                 try:
-                    cb.on_value_change(lambda v, mid=m.id, cb_ref=cb: asyncio.create_task(_handle_cb_change(mid=mid, cb_ref=cb_ref)))
-                    wired = True
+                    other.checkbox.value = None
                 except Exception:
                     pass
-                if not wired:
-                    cb.on('change', lambda e, mid=m.id, cb_ref=cb: asyncio.create_task(_handle_cb_change(mid=mid, cb_ref=cb_ref)))
-                    cb.on('update:model-value', lambda v, mid=m.id, cb_ref=cb: asyncio.create_task(_handle_cb_change(mid=mid, cb_ref=cb_ref)))
 
-                self._row_entries.append({'row': row, 'checkbox': cb, 'id': m.id})
+    def _active_rows(self) -> List[_RowHandles]:
+        return self._row_pool[:self._window_count]
+
+    def _row_for_index(self, index: int) -> Optional[_RowHandles]:
+        slot = index - self._window_start
+        if 0 <= slot < self._window_count:
+            return self._row_pool[slot]
+        return None
+
+    def _display_for(self, model: orc.ModelInfo) -> Tuple[str, bool]:
+        display = self._row_display.get(model.id)
+        if display is None:
+            display = (_format_date(model.created), self._supports_tool_calls(model))
+            self._row_display[model.id] = display
+        return display
 
     def _supports_tool_calls(self, model: orc.ModelInfo) -> bool:
         try:
@@ -337,15 +602,21 @@ class ModelSelector:
             self._focused_index = -1
             return
         new_index = max(0, min(len(self._models) - 1, new_index))
-        if new_index == self._focused_index:
+        if new_index == self._focused_index and self._row_for_index(new_index) is not None:
             return
-        if 0 <= self._focused_index < len(self._row_entries):
-            row_old = self._row_entries[self._focused_index]['row']
-            assert isinstance(row_old, ui.element)
-            row_old.classes(remove='bg-indigo-600/10')
+        old_handles = self._row_for_index(self._focused_index)
+        if old_handles is not None:
+            old_handles.row.classes(remove='bg-indigo-600/10')
         self._focused_index = new_index
-        row_new = self._row_entries[self._focused_index]['row']
-        assert isinstance(row_new, ui.element)
+        handles = self._row_for_index(new_index)
+        if handles is None:
+            # Keyboard focus left the rendered window: slide the window so the row exists.
+            self._window_start = max(0, new_index - _OVERSCAN_ROWS)
+            self._render_rows()
+            handles = self._row_for_index(new_index)
+            if handles is None:
+                return
+        row_new = handles.row
         row_new.classes('bg-indigo-600/10')
         try:
             row_new.run_method('scrollIntoView', {'block': 'nearest', 'inline': 'nearest'})
@@ -358,46 +629,79 @@ class ModelSelector:
         self._set_focus((self._focused_index if self._focused_index >= 0 else 0) + delta)
 
     def _toggle_focused_selection(self) -> None:
-        if not (0 <= self._focused_index < len(self._row_entries)):
+        if not (0 <= self._focused_index < len(self._models)):
             return
-        mid = str(self._row_entries[self._focused_index]['id'])
-        cb = self._row_entries[self._focused_index]['checkbox']
-        assert isinstance(cb, ui.element)
-        
+        mid = self._models[self._focused_index].id
+        handles = self._row_by_mid.get(mid)
         if self.single_selection:
-            # Radio button behavior: always select this one (clearing others)
-            self._selected_ids.clear()
-            self._selected_ids.add(mid)
-            cb.value = mid
-            # Update all other radio buttons to be unselected
-            for entry in self._row_entries:
-                other_cb = entry.get('checkbox')
-                other_id = entry.get('id')
-                if other_cb and other_id != mid:
-                    try:
-                        other_cb.value = None
-                    except Exception:
-                        pass
-        else:
+            # Radio button behavior: always select this one (clearing the previous one)
+            previous = self._selected_ids
+            self._mutate_selection(replace=(mid,))
+            self._clear_radios(previous, keep=handles)
+            if handles is not None:
+                handles.checkbox.value = mid
+        elif mid in self._selected_ids:
             # Checkbox behavior: toggle
-            if mid in self._selected_ids:
-                self._selected_ids.remove(mid)
-                cb.value = False
-            else:
-                self._selected_ids.add(mid)
-                cb.value = True
-        
+            self._mutate_selection(remove=(mid,))
+            if handles is not None:
+                handles.checkbox.value = False
+        else:
+            self._mutate_selection(add=(mid,))
+            if handles is not None:
+                handles.checkbox.value = True
+
         self._preview_selection_update()
         try:
             asyncio.create_task(self._apply_immediately())
         except Exception:
             pass
 
+    # --- Selection state ---
+
+    def _mutate_selection(
+        self,
+        *,
+        add: Iterable[str] = (),
+        remove: Iterable[str] = (),
+        replace: Optional[Iterable[str]] = None,
+    ) -> None:
+        previous = self._selected_ids
+        base = frozenset(replace) if replace is not None else previous
+        updated = base.difference(remove).union(add)
+        if updated == previous:
+            return
+        self._selected_ids = updated
+        self._selected_value = None
+        previous_sorted = self._selected_sorted
+        if replace is not None or previous_sorted is None:
+            self._selected_sorted = None
+            return
+        # Toggles touch one or two ids: patch a copy of the sorted list (already handed out
+        # to callers, so never mutated in place) instead of re-sorting the whole selection.
+        sorted_ids = list(previous_sorted)
+        for mid in previous.difference(updated):
+            del sorted_ids[bisect_left(sorted_ids, mid)]
+        for mid in updated.difference(previous):
+            insort(sorted_ids, mid)
+        self._selected_sorted = sorted_ids
+
+    def _sorted_selection(self) -> List[str]:
+        if self._selected_sorted is None:
+            self._selected_sorted = sorted(self._selected_ids)
+        return self._selected_sorted
+
+    def _selection_value(self) -> str:
+        if self._selected_value is None:
+            self._selected_value = self._format_value(self._sorted_selection())
+        return self._selected_value
+
     @staticmethod
     def _parse_value(value: str) -> Set[str]:
         if not value:
             return set()
-        return {s.strip() for s in value.split(',') if s.strip()}
+        # Strip each piece once; empty pieces (", ," or trailing commas) are dropped. The
+        # whole pipeline runs in C builtins (map/filter/str.strip/sys.intern).
+        return set(map(sys.intern, filter(None, map(str.strip, value.split(',')))))
 
     @staticmethod
     def _format_value(ids: List[str]) -> str:
@@ -408,45 +712,55 @@ class ModelSelector:
     def _preview_selection_update(self) -> None:
         # Update the read-only input text to reflect current (not-yet-applied) selection
         try:
-            self._set_input_value(self._format_value(sorted(self._selected_ids)))
+            self._set_input_value(self._selection_value())
         except Exception:
             pass
 
     def _render_chips(self) -> None:
+        # Chips are diffed against the selection: only removed ids are deleted and only
+        # new ids are built, so toggling one model does not recreate every chip.
+        if self._chips_selection is self._selected_ids:
+            # Every apply path calls this; nothing to send when the selection is unchanged.
+            return
         try:
-            self._chips_row.clear()
-            selected_sorted = sorted(self._selected_ids)
+            selected_sorted = self._sorted_selection()
             has_selection = bool(selected_sorted)
             self._chips_row.visible = has_selection
             self._error_message.visible = not has_selection
-            for mid in selected_sorted:
-                with self._chips_row:
-                    with ui.row().classes('items-center gap-1 px-2 py-1 rounded bg-gray-100 dark:bg-gray-800 text-sm'):
-                        ui.label(mid).classes('truncate max-w-[240px]')
-                        # close icon to remove selection
-                        def _mk_remove(mid_str: str):
-                            async def _remove(_=None):
-                                try:
-                                    if mid_str in self._selected_ids:
-                                        self._selected_ids.remove(mid_str)
-                                    # if row is visible, also uncheck its checkbox
-                                    try:
-                                        for entry in self._row_entries:
-                                            if entry.get('id') == mid_str:
-                                                cb = entry.get('checkbox')
-                                                if cb is not None:
-                                                    cb.value = False
-                                                break
-                                    except Exception:
-                                        pass
-                                    await self._apply_immediately()
-                                except Exception:
-                                    pass
-                            return _remove
-                        ui.icon('close').classes('cursor-pointer text-gray-500 hover:text-gray-700').on('click', _mk_remove(mid))
+            chips = self._chip_widgets
+            for mid in set(chips).difference(self._selected_ids):
+                chips.pop(mid).delete()
+            for index, mid in enumerate(selected_sorted):
+                if mid not in chips:
+                    # Survivors keep their relative order, so slotting each new chip at its
+                    # sorted index keeps the row sorted.
+                    chips[mid] = self._build_chip(mid).move(target_index=index)
+            self._chips_selection = self._selected_ids
         except Exception:
             pass
 
+    def _build_chip(self, mid: str) -> ui.element:
+        async def _remove(_=None):
+            try:
+                self._mutate_selection(remove=(mid,))
+                # if row is visible, also uncheck its checkbox
+                try:
+                    handles = self._row_by_mid.get(mid)
+                    if handles is not None:
+                        handles.checkbox.value = None if self.single_selection else False
+                except Exception:
+                    pass
+                await self._apply_immediately()
+            except Exception:
+                pass
+
+        with self._chips_row:
+            with ui.row().classes('items-center gap-1 px-2 py-1 rounded bg-gray-100 dark:bg-gray-800 text-sm') as chip:
+                ui.label(mid).classes('truncate max-w-[240px]')
+                # close icon to remove selection
+                ui.icon('close').classes('cursor-pointer text-gray-500 hover:text-gray-700').on('click', _remove)
+        return chip
+
     def _set_input_value(self, value: str) -> None:
         try:
             # Preferred: use NiceGUI's reactive setter
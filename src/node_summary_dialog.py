@@ -1,12 +1,43 @@
 from __future__ import annotations
 
 import html as _html
+import io
 from typing import Dict, List, Tuple
 
 from nicegui import ui
 
 from .interfaces import IterationNode
-from .view_utils import format_html_size
+from .view_utils import utf8_size
+
+
+_SUMMARY_CSS = (
+    "<style>"
+    ".summary-table { width: 100%; border-collapse: collapse; }"
+    ".summary-header th { text-align: left; font-weight: 600; padding: 8px 12px; font-size: 0.85rem; }"
+    ".summary-cell { padding: 8px 12px; font-size: 0.85rem; border-top: 1px solid rgba(148, 163, 184, 0.3); }"
+    ".summary-total-row { background: rgba(148, 163, 184, 0.08); }"
+    ".text-right { text-align: right; }"
+    ".text-left { text-align: left; }"
+    ".font-semibold { font-weight: 600; }"
+    ".summary-wrapper { max-height: 60vh; overflow-y: auto; }"
+    "</style>"
+)
+
+_TABLE_OPEN = (
+    "<div class='summary-wrapper'>"
+    "<table class='summary-table'>"
+    "<thead class='summary-header'><tr>"
+    "<th>Model</th><th class='text-right'>Price</th><th class='text-right'>Time</th><th class='text-right'>HTML Size</th>"
+    "</tr></thead>"
+    "<tbody>"
+)
+
+_TABLE_CLOSE = "</tbody></table></div>"
+
+_HIGHLIGHT_STYLE = ' style="color:#ef4444;font-weight:600;"'
+
+# Characters html.escape rewrites; slugs rarely contain any, so most labels skip escaping.
+_HTML_SPECIAL = frozenset('&<>"\'')
 
 
 def _format_kb_from_bytes(size_bytes: int) -> str:
@@ -26,7 +57,7 @@ def create_node_summary_dialog(node: IterationNode) -> Tuple[ui.dialog, str, boo
         raw_cost = getattr(out, 'total_cost', None)
         raw_time = getattr(out, 'generation_time', None)
         html_output = getattr(out, 'html_output', '') or ''
-        size_bytes = len(html_output.encode('utf-8'))
+        size_bytes = utf8_size(html_output)
 
         cost_value = float(raw_cost) if isinstance(raw_cost, (int, float)) else None
         time_value = float(raw_time) if isinstance(raw_time, (int, float)) else None
@@ -44,7 +75,7 @@ def create_node_summary_dialog(node: IterationNode) -> Tuple[ui.dialog, str, boo
             'size_value': size_bytes,
             'price_display': f"${cost_value:.6f}" if cost_value is not None else '$—',
             'time_display': f"{time_value:.1f}s" if time_value is not None else '—',
-            'size_display': format_html_size(html_output),
+            'size_display': _format_kb_from_bytes(size_bytes),
         })
 
     total_cost = sum(cost_values) if cost_values else 0.0
@@ -57,71 +88,54 @@ def create_node_summary_dialog(node: IterationNode) -> Tuple[ui.dialog, str, boo
     summary_time_label = f"{max_time:.1f} seconds" if max_time is not None else '0.0 seconds'
     summary_size_label = _format_kb_from_bytes(total_size_bytes)
 
-    table_html_rows: List[str] = []
     highlight_cost = max_cost if max_cost is not None else None
     highlight_time = max_time if max_time is not None else None
     highlight_size = max(size_values) if size_values else None
 
+    # Stream the table into one buffer instead of building per-row strings and joining them.
+    # Price/time/size cells come from local format strings (digits, '$', '.', 's', 'KB', '—')
+    # and are written unescaped; only model slugs are user/API data.
+    esc = _html.escape
+    special = _HTML_SPECIAL
+    buf = io.StringIO()
+    write = buf.write
+    write(_SUMMARY_CSS)
+    write(_TABLE_OPEN)
     for row in data_rows:
-        model_label = _html.escape(row['model'])
-        price_display = _html.escape(row['price_display'])
-        time_display = _html.escape(row['time_display'])
-        size_display = _html.escape(row['size_display'])
-
-        price_style = ''
+        write("<tr><td class='summary-cell text-left'>")
+        model_label = row['model']
+        write(model_label if special.isdisjoint(model_label) else esc(model_label))
+        write("</td><td class='summary-cell text-right'")
         if highlight_cost is not None and row['price_value'] == highlight_cost:
-            price_style = ' style="color:#ef4444;font-weight:600;"'
-
-        time_style = ''
+            write(_HIGHLIGHT_STYLE)
+        write(">")
+        write(row['price_display'])
+        write("</td><td class='summary-cell text-right'")
         if highlight_time is not None and row['time_value'] == highlight_time:
-            time_style = ' style="color:#ef4444;font-weight:600;"'
-
-        size_style = ''
+            write(_HIGHLIGHT_STYLE)
+        write(">")
+        write(row['time_display'])
+        write("</td><td class='summary-cell text-right'")
         if highlight_size is not None and row['size_value'] == highlight_size:
-            size_style = ' style="color:#ef4444;font-weight:600;"'
-
-        table_html_rows.append(
-            f"<tr>"
-            f"<td class='summary-cell text-left'>{model_label}</td>"
-            f"<td class='summary-cell text-right'{price_style}>{price_display}</td>"
-            f"<td class='summary-cell text-right'{time_style}>{time_display}</td>"
-            f"<td class='summary-cell text-right'{size_style}>{size_display}</td>"
-            f"</tr>"
-        )
+            write(_HIGHLIGHT_STYLE)
+        write(">")
+        write(row['size_display'])
+        write("</td></tr>")
 
     total_time_display = (
         f"max {max_time:.1f}s · avg {avg_time:.1f}s" if time_values else 'max 0.0s · avg 0.0s'
     )
     total_size_display = _format_kb_from_bytes(total_size_bytes)
-    table_html_rows.append(
-        "<tr class='summary-total-row'>"
-        "<td class='summary-cell text-left font-semibold'>Total</td>"
-        f"<td class='summary-cell text-right font-semibold'>{_html.escape(summary_cost_label)}</td>"
-        f"<td class='summary-cell text-right font-semibold'>{_html.escape(total_time_display)}</td>"
-        f"<td class='summary-cell text-right font-semibold'>{_html.escape(total_size_display)}</td>"
-        "</tr>"
-    )
-
-    table_html = (
-        "<style>"
-        ".summary-table { width: 100%; border-collapse: collapse; }"
-        ".summary-header th { text-align: left; font-weight: 600; padding: 8px 12px; font-size: 0.85rem; }"
-        ".summary-cell { padding: 8px 12px; font-size: 0.85rem; border-top: 1px solid rgba(148, 163, 184, 0.3); }"
-        ".summary-total-row { background: rgba(148, 163, 184, 0.08); }"
-        ".text-right { text-align: right; }"
-        ".text-left { text-align: left; }"
-        ".font-semibold { font-weight: 600; }"
-        ".summary-wrapper { max-height: 60vh; overflow-y: auto; }"
-        "</style>"
-        "<div class='summary-wrapper'>"
-        "<table class='summary-table'>"
-        "<thead class='summary-header'><tr>"
-        "<th>Model</th><th class='text-right'>Price</th><th class='text-right'>Time</th><th class='text-right'>HTML Size</th>"
-        "</tr></thead>"
-        "<tbody>"
-        + ''.join(table_html_rows)
-        + "</tbody></table></div>"
-    )
+    write("<tr class='summary-total-row'><td class='summary-cell text-left font-semibold'>Total</td>")
+    write("<td class='summary-cell text-right font-semibold'>")
+    write(summary_cost_label)
+    write("</td><td class='summary-cell text-right font-semibold'>")
+    write(total_time_display)
+    write("</td><td class='summary-cell text-right font-semibold'>")
+    write(total_size_display)
+    write("</td></tr>")
+    write(_TABLE_CLOSE)
+    table_html = buf.getvalue()
 
     summary_dialog = ui.dialog()
     summary_dialog.props('persistent')
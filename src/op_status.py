@@ -3,18 +3,31 @@ from __future__ import annotations
 
 import threading
 import time
-from typing import Dict, Tuple, List, Dict as _Dict
+from collections import deque
+from typing import Deque, Dict, Tuple, List, Dict as _Dict
 
-# Map of worker -> (phase, started_at)
+# Map of worker -> (phase, started_at). Writers serialize on _lock; readers take a
+# snapshot with a single (GIL-atomic) list(dict.items()) call and need no lock.
 _phases: Dict[str, Tuple[str, float]] = {}
 _lock = threading.Lock()
-_notifications: List[_Dict[str, object]] = []
+# deque.append/popleft are atomic, so producers and the UI drain loop need no lock.
+_notifications: Deque[_Dict[str, object]] = deque()
 
 
 def set_phase(worker: str, phase: str) -> None:
-    """Set current phase text for a given worker."""
+    """Set current phase text for a given worker.
+
+    Re-asserting the phase a worker is already in is a no-op, so its elapsed time keeps running.
+    """
     w = worker or "default"
+    # Unlocked pre-check: a worker re-asserting its own phase skips the lock entirely.
+    current = _phases.get(w)
+    if (current[0] if current is not None else "") == phase:
+        return
     with _lock:
+        current = _phases.get(w)
+        if (current[0] if current is not None else "") == phase:
+            return
         if phase:
             _phases[w] = (phase, time.monotonic())
         else:
@@ -33,9 +46,9 @@ def clear_all() -> None:
 
 def get_all_phases() -> Dict[str, Tuple[str, float]]:
     """Return mapping of worker -> (phase, elapsed_seconds)."""
-    with _lock:
-        now = time.monotonic()
-        return {w: (p, max(0.0, now - ts)) for w, (p, ts) in _phases.items()}
+    snapshot = list(_phases.items())
+    now = time.monotonic()
+    return {w: (p, max(0.0, now - ts)) for w, (p, ts) in snapshot}
 
 
 # --- UI notification queue ---
@@ -57,13 +70,14 @@ def enqueue_notification(
         "timeout": timeout,
         "close_button": bool(close_button),
     }
-    with _lock:
-        _notifications.append(item)
+    _notifications.append(item)
 
 
 def drain_notifications() -> List[_Dict[str, object]]:
     """Return and clear all queued notifications."""
-    with _lock:
-        items = list(_notifications)
-        _notifications.clear()
-        return items
+    items: List[_Dict[str, object]] = []
+    while True:
+        try:
+            items.append(_notifications.popleft())
+        except IndexError:
+            return items
@@ -20,12 +20,21 @@ from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
 from pathlib import Path
 import asyncio
 import base64
-import json
+from collections import OrderedDict
+import email.utils
+import errno
+import hashlib
+import logging
 import mimetypes
 import os
 import random
+import sys
+import threading
 import time
+import weakref
 
+import httpx
+import orjson
 from openai import (
     AsyncOpenAI,
     APIStatusError,
@@ -33,6 +42,7 @@ from openai import (
     APITimeoutError,
     RateLimitError,
 )
+from openai.types.chat import ChatCompletion
 from dotenv import load_dotenv
 from dataclasses import dataclass, field
 from . import context_data, logging as log_utils, op_status
@@ -44,13 +54,18 @@ from .chrome_devtools_service import (
     get_current_devtools_agent_id,
 )
 
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
 # ---------------- Settings & client ---------------- #
 
 TIMEOUT_SECONDS: float = 120.0
+# One pooled HTTP/2 connection set per event loop is shared by every OpenRouter request on it;
+# agent tool loops reuse warm connections instead of re-handshaking per call.
+HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60.0)
 
 
-load_dotenv()
-
 DEFAULT_ANALYZE_SCREEN_PROMPT = (
     "Analyze the captured screenshot of the application UI. Describe visible elements, layout, "
     "animations, and any rendering errors. Call out whether recent code changes appear on screen "
@@ -76,7 +91,30 @@ class ModelInfo:
     prompt_price: float        # Price per million input tokens ($)
     completion_price: float    # Price per million output tokens ($)
     created: int               # Unix timestamp when model was created
-    supported_parameters: List[str] = field(default_factory=list)  # Supported parameters as reported by API
+    supported_parameters: tuple[str, ...] = ()  # Supported parameters as reported by API
+    price_str: str = field(default="", compare=False, repr=False)  # "$in / $out" display string, filled on construction
+    search_key: str = field(default="", compare=False, repr=False)  # lower-cased "id\0name" for substring queries
+    param_set: frozenset[str] = field(default=frozenset(), compare=False, repr=False)  # normalized supported_parameters
+
+
+    def __post_init__(self) -> None:
+        # Lower-case once so query filtering does not re-lower every id/name per call.
+        if not self.search_key:
+            object.__setattr__(self, "search_key", f"{self.id.lower()}\0{str(self.name).lower()}")
+        # Prices never change for a fetched model, so format the display string once here.
+        if not self.price_str:
+            try:
+                price_str = f"${self.prompt_price:,.2f} / ${self.completion_price:,.2f}"
+            except Exception:
+                price_str = "$0.00 / $0.00"
+            object.__setattr__(self, "price_str", price_str)
+        if not self.param_set and self.supported_parameters:
+            object.__setattr__(
+                self,
+                "param_set",
+                frozenset(str(p).strip().lower() for p in self.supported_parameters),
+            )
+
 
 
 @lru_cache
@@ -113,8 +151,54 @@ def _settings() -> _Settings:
     )
 
 
-@lru_cache
+# Clients are pooled per event loop: an httpx pool holds asyncio primitives bound to the
+# loop that first used it, so it must not be shared across loops (e.g. successive
+# asyncio.run() calls or a loop-per-thread host). Entries go away with their loop.
+_LOOP_HTTP_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_LOOP_API_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
+_CLIENTS_LOCK = threading.Lock()
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _per_loop(cache: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]", factory):
+    loop = _running_loop()
+    if loop is None:
+        # Nothing to bind to yet; hand out an uncached instance.
+        return factory()
+    client = cache.get(loop)
+    if client is None:
+        # Build outside the lock: the API client's factory fetches the per-loop httpx client
+        # through this same helper, and _CLIENTS_LOCK is not reentrant.
+        fresh = factory()
+        with _CLIENTS_LOCK:
+            client = cache.setdefault(loop, fresh)
+    return client
+
+
+def _httpx_client() -> httpx.AsyncClient:
+    # http2=True requires the h2 package (httpx[http2] in requirements.txt).
+    return _per_loop(
+        _LOOP_HTTP_CLIENTS,
+        lambda: httpx.AsyncClient(
+            http2=True,
+            limits=HTTP_LIMITS,
+            timeout=TIMEOUT_SECONDS,
+            event_hooks={"response": [_observe_rate_limit]},
+        ),
+    )
+
+
 def _client() -> AsyncOpenAI:
+    return _per_loop(_LOOP_API_CLIENTS, _build_client)
+
+
+def _build_client() -> AsyncOpenAI:
     s = _settings()
     headers: Dict[str, str] = {
         "X-Title": "simple-vibe-iterator",
@@ -125,34 +209,56 @@ def _client() -> AsyncOpenAI:
         base_url=s.base_url,
         timeout=TIMEOUT_SECONDS,
         default_headers=headers,
+        http_client=_httpx_client(),
     )
 
 
+async def aclose() -> None:
+    """Close this loop's HTTP client (call on app shutdown); a later request builds a fresh one."""
+    loop = asyncio.get_running_loop()
+    with _CLIENTS_LOCK:
+        _LOOP_API_CLIENTS.pop(loop, None)
+        http = _LOOP_HTTP_CLIENTS.pop(loop, None)
+    if http is not None:
+        await http.aclose()
+
+
 # -------------- Model management -------------- #
 
 # Global cache for all models
 _MODELS_CACHE: Optional[List[ModelInfo]] = None
+# Vision-capable subset of _MODELS_CACHE, derived whenever the cache is refreshed
+_VISION_MODELS_CACHE: List[ModelInfo] = []
 _CACHE_TIMESTAMP: Optional[float] = None
 _CACHE_DURATION = 3600.0  # 1 hour
-_FETCH_LOCK = asyncio.Lock()
-_BROWSER_TOOL_PROVIDER = BrowserToolProvider() if BrowserToolProvider else None
-_BROWSER_TOOL_SPECS: List[Dict[str, Any]] = (
-    _BROWSER_TOOL_PROVIDER.get_all_tools() if _BROWSER_TOOL_PROVIDER else []
-)
-DEFAULT_TOOL_SPECS: List[Dict[str, Any]] = list(_BROWSER_TOOL_SPECS)
-_BROWSER_TOOL_NAMES = {
-    spec.get("function", {}).get("name")
-    for spec in _BROWSER_TOOL_SPECS
-    if isinstance(spec, dict) and spec.get("function", {}).get("name")
-}
-_CHROME_DEVTOOLS_SESSION_MANAGER = (
-    get_chrome_devtools_session_manager() if ChromeDevToolsService else None
-)
+_FETCH_LOCK: Optional[asyncio.Lock] = None
 _MODEL_INDEX: Dict[str, ModelInfo] = {}
 
 
+# Browser tool specs and the devtools session manager are built on first use, not at import.
+# Both are immutable so every chat turn can share them without a defensive copy.
+@lru_cache
+def _browser_tool_specs() -> tuple[Dict[str, Any], ...]:
+    provider = BrowserToolProvider() if BrowserToolProvider else None
+    return tuple(provider.get_all_tools()) if provider else ()
+
+
+@lru_cache
+def _browser_tool_names() -> frozenset[str]:
+    return frozenset(
+        spec.get("function", {}).get("name")
+        for spec in _browser_tool_specs()
+        if isinstance(spec, dict) and spec.get("function", {}).get("name")
+    )
+
+
+@lru_cache
+def _devtools_manager():
+    return get_chrome_devtools_session_manager() if ChromeDevToolsService else None
+
+
 async def _resolve_devtools_service() -> tuple[Optional[ChromeDevToolsService], bool]:
-    manager = _CHROME_DEVTOOLS_SESSION_MANAGER
+    manager = _devtools_manager()
     if manager is not None:
         agent_id = get_current_devtools_agent_id()
         if agent_id:
@@ -172,55 +278,58 @@ async def _fetch_all_models() -> List[ModelInfo]:
         # Use the existing OpenAI client which already has proper headers and auth
         client = _client()
         response = await client.models.list()
-        # Convert OpenAI response to dict format for compatibility
-        return {"data": [model.model_dump() for model in response.data]}
+        # SDK model objects are parsed directly (no model_dump() round-trip)
+        return response.data
     
     try:
         data = await _retry(api_call)
-        models = [_parse_model_data(m) for m in data.get("data", []) if _parse_model_data(m)]
-        return models
+        # Single pass: each entry is parsed once and failures (None) dropped
+        parsed = (_parse_model_data(m) for m in data or [])
+        return [m for m in parsed if m is not None]
     except Exception as e:
         raise RuntimeError(f"Failed to fetch models from OpenRouter API: {e}")
 
 
-def _remember_models(models: Iterable[ModelInfo]) -> None:
-    for model in models:
-        if not model or not getattr(model, "id", None):
-            continue
-        _MODEL_INDEX[model.id] = model
-
-
-def _parse_model_data(data: Dict[str, Any]) -> Optional[ModelInfo]:
-    """Parse raw model data from OpenRouter API into ModelInfo."""
+def _parse_model_data(data: Any) -> Optional[ModelInfo]:
+    """Parse raw model data from OpenRouter API (dict or SDK model object) into ModelInfo."""
     try:
-        model_id = data.get("id", "")
+        if isinstance(data, dict):
+            get = data.get
+        else:
+            # SDK models keep OpenRouter's extra fields (name, pricing, ...) as attributes
+            def get(key: str, default: Any = None) -> Any:
+                return getattr(data, key, default)
+
+        model_id = get("id", "")
         if not model_id:
             return None
             
-        name = data.get("name", model_id)
+        name = get("name", model_id)
         
         # Parse input modalities
-        architecture = data.get("architecture", {})
+        architecture = get("architecture", {})
         input_modalities = architecture.get("input_modalities", [])
         has_text_input = "text" in input_modalities
         has_image_input = "image" in input_modalities
         
         # Parse pricing (convert to $ per million tokens)
-        pricing = data.get("pricing", {})
+        pricing = get("pricing", {})
         prompt_price = float(pricing.get("prompt", "0")) * 1_000_000
         completion_price = float(pricing.get("completion", "0")) * 1_000_000
         
         # Parse created timestamp (defaults to 0 if not provided)
-        created = int(data.get("created", 0))
+        created = int(get("created", 0))
 
         # Parse supported parameters if present
-        sp = data.get("supported_parameters") or []
-        supported_parameters: List[str] = []
+        sp = get("supported_parameters") or []
+        supported_parameters: tuple[str, ...] = ()
         if isinstance(sp, list):
-            supported_parameters = [str(x) for x in sp if isinstance(x, (str, int, float))]
+            # The same few names ("temperature", "top_p", ...) repeat across every model
+            supported_parameters = tuple(sys.intern(str(x)) for x in sp if isinstance(x, (str, int, float)))
         
-        return ModelInfo(
-            id=model_id,
+        info = ModelInfo(
+            # Slugs are reused as set/dict keys across the UI and prefs; interning makes those lookups cheap.
+            id=sys.intern(str(model_id)),
             name=name,
             has_text_input=has_text_input,
             has_image_input=has_image_input,
@@ -229,8 +338,11 @@ def _parse_model_data(data: Dict[str, Any]) -> Optional[ModelInfo]:
             created=created,
             supported_parameters=supported_parameters,
         )
+        # Index at parse time; list_models never has to sweep the catalog to refresh it.
+        _MODEL_INDEX[info.id] = info
+        return info
     except Exception as e:
-        print(f"⚠️  Failed to parse model data: {e}")
+        logger.warning("Failed to parse model data: %s", e)
         return None
 
 
@@ -285,7 +397,8 @@ def _is_result_too_large(result: Any, limit_bytes: int = 100_000) -> bool:
     """Detect oversized evaluate_script results using UTF-8 length."""
 
     try:
-        serialized = json.dumps(result, ensure_ascii=False, default=str)
+        # orjson emits UTF-8 bytes directly, so no separate encode pass is needed
+        return len(orjson.dumps(result, default=str)) > limit_bytes
     except Exception:
         try:
             serialized = str(result)
@@ -323,13 +436,35 @@ def _resolve_analyze_screen_prompt(query: Optional[str]) -> tuple[str, str]:
     return prompt, model
 
 
-async def _execute_tool_call(model_slug: str, name: str, arguments: str) -> str:
+# Small parsed-arguments memo: agents repeat short argument strings (e.g. the same
+# key press or selector) across hops. Large ones such as load_html bodies are not kept.
+_TOOL_ARGS_MEMO: Dict[str, Any] = {}
+_TOOL_ARGS_MEMO_MAX = 64
+_TOOL_ARGS_MEMO_MAX_LEN = 512
+
+
+def _parse_tool_arguments(arguments: str) -> Any:
+    if not arguments or arguments == "{}":
+        return {}
+    cached = _TOOL_ARGS_MEMO.get(arguments)
+    if cached is not None:
+        return cached
     try:
-        payload = json.loads(arguments or "{}") if arguments else {}
-    except json.JSONDecodeError:
+        payload = orjson.loads(arguments)
+    except orjson.JSONDecodeError:
         payload = {"code": arguments}
+    if len(arguments) <= _TOOL_ARGS_MEMO_MAX_LEN:
+        if len(_TOOL_ARGS_MEMO) >= _TOOL_ARGS_MEMO_MAX:
+            _TOOL_ARGS_MEMO.pop(next(iter(_TOOL_ARGS_MEMO)))
+        _TOOL_ARGS_MEMO[arguments] = payload
+    return payload
+
 
-    if name in _BROWSER_TOOL_NAMES:
+async def _execute_tool_call(model_slug: str, name: str, arguments: str) -> str:
+    # Parsed payloads may be shared through the memo; tool handlers only read them.
+    payload = _parse_tool_arguments(arguments)
+
+    if name in _browser_tool_names():
         # Prefer the worker id from the current async context so all tool
         # phases attach to the same status row used by the calling service.
         worker = str(context_data.get("worker_id") or model_slug or "agent")
@@ -343,19 +478,49 @@ async def _execute_tool_call(model_slug: str, name: str, arguments: str) -> str:
             response = await _execute_browser_tool(name, payload)
         finally:
             op_status.set_phase(worker, coding_phase)
-        response_text = json.dumps(response, ensure_ascii=False)
+        response_text = orjson.dumps(response).decode("utf-8")
         try:
             log_utils.log_tool_call(
                 model=model_slug,
                 tool=name,
-                code=json.dumps(payload, ensure_ascii=False),
+                # The model already sent the arguments as JSON; log that text rather than re-dumping it.
+                code=arguments or "{}",
                 output=response_text,
             )
         except Exception:
             pass
         return response_text
 
-    return json.dumps({"error": f"Unknown tool: {name}"}, ensure_ascii=False)
+    return orjson.dumps({"error": f"Unknown tool: {name}"}).decode("utf-8")
+
+
+# Tools that only observe the page; consecutive calls to these may overlap. Anything
+# else (load_html, press_key, evaluate_script, wait_for) depends on what ran before it.
+_PARALLEL_SAFE_TOOLS = frozenset({"analyze_screen", "list_console_messages"})
+_TOOL_CONCURRENCY = 4
+
+
+async def _run_tool_calls(model_slug: str, functions: Sequence[Any]) -> List[str]:
+    """Execute one assistant turn's tool calls and return their outputs in call order."""
+    sem = asyncio.Semaphore(_TOOL_CONCURRENCY)
+
+    async def run(fn: Any) -> str:
+        async with sem:
+            return await _execute_tool_call(model_slug, fn.name, fn.arguments)
+
+    outputs: List[str] = []
+    batch: List[Any] = []
+    for fn in functions:
+        if fn.name in _PARALLEL_SAFE_TOOLS:
+            batch.append(fn)
+            continue
+        if batch:
+            outputs.extend(await asyncio.gather(*(run(f) for f in batch)))
+            batch = []
+        outputs.append(await _execute_tool_call(model_slug, fn.name, fn.arguments))
+    if batch:
+        outputs.extend(await asyncio.gather(*(run(f) for f in batch)))
+    return outputs
 
 
 async def _execute_browser_tool(name: str, payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -457,6 +622,39 @@ async def _execute_browser_tool(name: str, payload: Dict[str, Any]) -> Dict[str,
                 pass
 
 
+def _fetch_lock() -> asyncio.Lock:
+    # Created on first fetch, inside the running loop, rather than at import time.
+    global _FETCH_LOCK
+    if _FETCH_LOCK is None:
+        _FETCH_LOCK = asyncio.Lock()
+    return _FETCH_LOCK
+
+
+def _models_cache_stale() -> bool:
+    if _MODELS_CACHE is None or _CACHE_TIMESTAMP is None:
+        return True
+    return (time.monotonic() - _CACHE_TIMESTAMP) > _CACHE_DURATION
+
+
+async def _ensure_models_loaded(force_refresh: bool = False) -> None:
+    global _MODELS_CACHE, _VISION_MODELS_CACHE, _CACHE_TIMESTAMP
+
+    # Fresh cache: read it without queueing behind the fetch lock. Otherwise take the
+    # lock and re-check, so concurrent callers share a single fetch.
+    if force_refresh or _models_cache_stale():
+        async with _fetch_lock():
+            if force_refresh or _models_cache_stale():
+                logger.info("Fetching available models from OpenRouter API")
+                try:
+                    _MODELS_CACHE = await _fetch_all_models()
+                    _VISION_MODELS_CACHE = [m for m in _MODELS_CACHE if m.has_image_input]
+                    _CACHE_TIMESTAMP = time.monotonic()
+                    logger.info("Loaded %d available models", len(_MODELS_CACHE))
+                except Exception as e:
+                    logger.warning("Failed to fetch models from API: %s", e)
+                    raise
+
+
 async def list_models(query: str = "", vision_only: bool = False, limit: int = 20, force_refresh: bool = False) -> List[ModelInfo]:
     """List available models with filtering and 1-hour caching.
     
@@ -469,72 +667,74 @@ async def list_models(query: str = "", vision_only: bool = False, limit: int = 2
     Returns:
         Filtered list of ModelInfo objects
     """
-    global _MODELS_CACHE, _CACHE_TIMESTAMP
-    
-    # Load models with caching and locking to prevent concurrent fetches
-    async with _FETCH_LOCK:
-        now = time.monotonic()
-        cache_expired = (_CACHE_TIMESTAMP is None or (now - _CACHE_TIMESTAMP) > _CACHE_DURATION)
-        
-        if force_refresh or _MODELS_CACHE is None or cache_expired:
-            print("🔄 Fetching available models from OpenRouter API...")
-            try:
-                _MODELS_CACHE = await _fetch_all_models()
-                _CACHE_TIMESTAMP = now
-                _remember_models(_MODELS_CACHE)
-                print(f"✅ Successfully loaded {len(_MODELS_CACHE)} available models")
-            except Exception as e:
-                print(f"❌ Failed to fetch models from API: {e}")
-                raise
-        elif _MODELS_CACHE:
-            _remember_models(_MODELS_CACHE)
-    
-    models = _MODELS_CACHE or []
-    
+    await _ensure_models_loaded(force_refresh)
+
     # Apply filters
-    if vision_only:
-        models = [m for m in models if m.has_image_input]
+    models = _VISION_MODELS_CACHE if vision_only else (_MODELS_CACHE or [])
     
     query_lower = query.lower().strip()
     if query_lower:
-        models = [m for m in models if query_lower in m.id.lower() or query_lower in m.name.lower()]
+        models = [m for m in models if query_lower in m.search_key]
     
     return models[:limit]
 
 
-async def _get_model_info(slug: Optional[str]) -> Optional[ModelInfo]:
+async def get_model_info(slug: Optional[str]) -> Optional[ModelInfo]:
+    """Return the catalog entry for one model slug, or None if the catalog does not list it.
+
+    A dict lookup while the catalog is fresh; a cold or expired (_CACHE_DURATION) cache
+    triggers a fetch first. If a refresh fails, the existing index keeps being served.
+    """
     if not slug:
         return None
-    info = _MODEL_INDEX.get(slug)
-    if info is not None:
-        return info
-    try:
-        await list_models(limit=2000)
-    except Exception:
-        return None
+    if not _MODEL_INDEX or _models_cache_stale():
+        try:
+            await _ensure_models_loaded()
+        except Exception:
+            if not _MODEL_INDEX:
+                return None
+    # The index holds every model from the last catalog fetch; a miss means the slug is unknown.
     return _MODEL_INDEX.get(slug)
 
 
+_TOOL_KEYS = frozenset({"tools", "function_calling", "function_call", "tool_choice", "parallel_tool_calls"})
+_REASONING_CONFLICT_PARAMS = frozenset({"response_format", "tools", "tool_choice", "structured_outputs"})
+_REASONING_SKIP_SLUG_PARTS = ("openai/gpt-5", "google/gemini")
+
+
 def _model_supports_tools(info: Optional[ModelInfo]) -> bool:
     if not info:
         return False
-    params = {str(p).strip().lower() for p in (info.supported_parameters or [])}
-    tool_keys = {"tools", "function_calling", "function_call", "tool_choice", "parallel_tool_calls"}
-    return bool(params.intersection(tool_keys))
+    return not info.param_set.isdisjoint(_TOOL_KEYS)
+
+
+@lru_cache(maxsize=512)
+def _reasoning_profile(slug: str, params: frozenset[str], has_conflicts: bool) -> tuple[bool, bool]:
+    """Return (inject include_reasoning, inject reasoning effort) for a model."""
+    if has_conflicts or any(part in slug for part in _REASONING_SKIP_SLUG_PARTS):
+        return False, False
+    return "include_reasoning" in params, "reasoning" in params
 
 
 # -------------- Internal helpers -------------- #
 
-def _import_config():
-    """Import config module with fallback for different import contexts."""
+@lru_cache
+def _config_module():
+    """Resolve the config module once; the import fallback is not re-run per call."""
     try:
         from . import config as app_config  # type: ignore
-        return app_config.get_config()
+        return app_config
     except Exception:
         import config as app_config  # type: ignore
-        return app_config.get_config()
+        return app_config
 
 
+def _import_config():
+    """Return the app config (get_config() is itself cached)."""
+    return _config_module().get_config()
+
+
+@lru_cache
 def _import_model_params():
     """Import model_params module with fallback for different import contexts."""
     try:
@@ -554,24 +754,21 @@ async def _merge_model_params(model: Optional[str], kwargs: Dict[str, Any]) -> D
         slug = model or s.code_model
         mp = _import_model_params()
 
-        # Use cached models if present; otherwise fetch one page
-        mlist = await list_models(force_refresh=False, limit=2000)
-        sp = next((m.supported_parameters for m in mlist if m.id == slug), [])
+        # Index lookup; refetches the catalog only when it is empty or past its TTL.
+        # An unknown slug yields None (no stored-param filtering, no reasoning injection).
+        info = await get_model_info(slug)
+        sp = info.supported_parameters if info else ()
 
         # Auto-inject reasoning parameters for models that actually support them
         # But skip if there are conflicting parameters that don't work well with reasoning
-        conflicting_params = {"response_format", "tools", "tool_choice", "structured_outputs"}
-        has_conflicts = any(param in merged_kwargs for param in conflicting_params)
-        skip_reasoning = (
-            has_conflicts or
-            any(conflict in slug for conflict in ["openai/gpt-5", "google/gemini"])
+        has_conflicts = not _REASONING_CONFLICT_PARAMS.isdisjoint(merged_kwargs)
+        inject_include, inject_effort = _reasoning_profile(
+            slug, info.param_set if info else frozenset(), has_conflicts
         )
-
-        if not skip_reasoning:
-            if "include_reasoning" in sp and "include_reasoning" not in merged_kwargs:
-                merged_kwargs["include_reasoning"] = True
-            if "reasoning" in sp and "reasoning" not in merged_kwargs:
-                merged_kwargs["reasoning"] = {"effort": "high"}
+        if inject_include and "include_reasoning" not in merged_kwargs:
+            merged_kwargs["include_reasoning"] = True
+        if inject_effort and "reasoning" not in merged_kwargs:
+            merged_kwargs["reasoning"] = {"effort": "high"}
 
         stored = mp.get_sanitized_params_for_api(slug, sp)
         # Stored defaults < explicit kwargs
@@ -588,7 +785,12 @@ async def _merge_model_params(model: Optional[str], kwargs: Dict[str, Any]) -> D
     return merged_kwargs
 
 def _guess_mime(path: Union[str, Path]) -> str:
-    mt, _ = mimetypes.guess_type(str(path))
+    return _mime_by_ext(os.path.splitext(str(path))[1].lower())
+
+
+@lru_cache(maxsize=64)
+def _mime_by_ext(ext: str) -> str:
+    mt, _ = mimetypes.guess_type("x" + ext)
     return mt or "image/png"
 
 
@@ -600,62 +802,212 @@ def encode_image_to_data_url(
     Accepts raw bytes or a filesystem path; returns a data: URL suitable
     for OpenAI/OpenRouter Chat Completions image input.
     """
+    # Cheapest checks first: in-memory buffers and data: URLs never touch the filesystem.
+    if isinstance(data, (bytes, bytearray)):
+        # b64encode reads any buffer; a view avoids copying a bytearray screenshot first
+        return _data_url_from_buffer(mime or "image/png", memoryview(data))
     if isinstance(data, str) and data.startswith("data:"):
         return data
-    if isinstance(data, (str, Path)):
-        p = Path(str(data))
-        if p.exists():
-            raw = p.read_bytes()
-            mime = mime or _guess_mime(p)
-        else:
-            # Treat as literal content (e.g., HTML canvas export) rather than a file path
-            raw = data.encode("utf-8")
-            mime = mime or "text/plain"
-    elif isinstance(data, (bytes, bytearray)):
-        raw = bytes(data)
-        mime = mime or "image/png"
-    else:
+    if not isinstance(data, (str, Path)):
         raise ValueError("encode_image_to_data_url expects bytes, data: URL, or existing file path")
+    p = Path(data)
+    try:
+        # Open directly instead of exists() + open: one filesystem probe, not two
+        return _data_url_from_file(mime or _guess_mime(p), p)
+    except OSError as exc:
+        # Not a path at all (missing, or too long to be a file name); other OS errors are real.
+        if not isinstance(exc, (FileNotFoundError, NotADirectoryError)) and exc.errno != errno.ENAMETOOLONG:
+            raise
+    except ValueError:
+        # Embedded NUL byte: cannot be a path
+        pass
+    # Treat as literal content (e.g., HTML canvas export) rather than a file path
+    return _data_url_from_buffer(mime or "text/plain", str(data).encode("utf-8"))
+
+
+async def encode_image_to_data_url_async(
+    data: Union[bytes, str, Path],
+    mime: Optional[str] = None,
+) -> str:
+    """encode_image_to_data_url with the file read and base64 pass run off the event loop."""
+    if isinstance(data, str) and data.startswith("data:"):
+        return data
+    return await asyncio.to_thread(encode_image_to_data_url, data, mime)
+
+
+# Multiple of 3, so consecutive chunks base64-encode with no padding in between.
+_B64_CHUNK = 48 * 1024
+
+
+def _encode_chunks_to_data_url(mime: str, size: int, chunks: Iterable[Any]) -> str:
+    # Encode chunk by chunk into one pre-sized ASCII buffer holding the prefix, then decode
+    # once; no full-size intermediate base64 bytes/str objects are created.
+    prefix = f"data:{mime};base64,".encode("ascii")
+    out = bytearray(len(prefix) + 4 * ((size + 2) // 3))
+    out[: len(prefix)] = prefix
+    pos = len(prefix)
+    for chunk in chunks:
+        enc = base64.b64encode(chunk)
+        out[pos:pos + len(enc)] = enc
+        pos += len(enc)
+    del out[pos:]  # a file may have shrunk after it was sized
+    return out.decode("ascii")
+
+
+def _data_url_from_buffer(mime: str, raw: Union[bytes, memoryview]) -> str:
+    view = memoryview(raw)
+    chunks = (view[i:i + _B64_CHUNK] for i in range(0, len(view), _B64_CHUNK))
+    return _encode_chunks_to_data_url(mime, len(view), chunks)
+
+
+# Recently encoded files, keyed by (path, mtime_ns, size, mime) and bounded by total URL
+# length: the same screenshot is commonly sent to several models in one transition.
+_FILE_URL_CACHE: "OrderedDict[tuple[str, int, int, str], str]" = OrderedDict()
+_FILE_URL_CACHE_BUDGET = 64 * 1024 * 1024
+_file_url_cache_bytes = 0
+_FILE_URL_CACHE_LOCK = threading.Lock()  # encodes also run in worker threads
+
+
+def _data_url_from_file(mime: str, path: Path) -> str:
+    global _file_url_cache_bytes
+    # Stream the file so the raw image is never fully resident next to its encoding.
+    with path.open("rb") as f:
+        st = os.fstat(f.fileno())
+        key = (str(path), st.st_mtime_ns, st.st_size, mime)
+        with _FILE_URL_CACHE_LOCK:
+            url = _FILE_URL_CACHE.get(key)
+            if url is not None:
+                _FILE_URL_CACHE.move_to_end(key)
+                return url
+        url = _encode_chunks_to_data_url(mime, st.st_size, iter(lambda: f.read(_B64_CHUNK), b""))
+    if len(url) <= _FILE_URL_CACHE_BUDGET // 4:
+        with _FILE_URL_CACHE_LOCK:
+            if key not in _FILE_URL_CACHE:
+                _FILE_URL_CACHE[key] = url
+                _file_url_cache_bytes += len(url)
+                while _file_url_cache_bytes > _FILE_URL_CACHE_BUDGET:
+                    _, old = _FILE_URL_CACHE.popitem(last=False)
+                    _file_url_cache_bytes -= len(old)
+    return url
+
+
+_RETRY_CAP_S = 30.0  # longest server-requested wait honored
+_MAX_BACKOFF_S = 8.0  # longest self-chosen backoff; keeps a flaky model from stalling a run
+
+
+def _retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """Server-requested wait from Retry-After or OpenRouter's X-RateLimit-Reset, if present."""
+    return _header_delay(getattr(getattr(exc, "response", None), "headers", None))
+
+
+def _header_delay(headers: Any) -> Optional[float]:
+    if not headers:
+        return None
+    try:
+        raw = headers.get("retry-after")
+        if raw:
+            try:
+                delay = float(raw)
+            except ValueError:
+                # HTTP-date form
+                delay = email.utils.parsedate_to_datetime(raw).timestamp() - time.time()
+            return min(_RETRY_CAP_S, max(0.0, delay))
+        raw = headers.get("x-ratelimit-reset")
+        if raw:
+            reset = float(raw)
+            # Epoch milliseconds (OpenRouter) or epoch seconds; anything smaller is a delta.
+            if reset > 1e12:
+                reset = reset / 1000.0 - time.time()
+            elif reset > 1e9:
+                reset = reset - time.time()
+            return min(_RETRY_CAP_S, max(0.0, reset))
+    except Exception:
+        return None
+    return None
+
 
-    b64 = base64.b64encode(raw).decode("ascii")
-    return f"data:{mime};base64,{b64}"
+# Monotonic time before which new chat requests hold off. Set from response headers when
+# OpenRouter reports the request budget spent (or answers 429), so queued requests wait
+# for the reset instead of each drawing a 429 and backing off on its own.
+_PACE_UNTIL: float = 0.0
+
+
+async def _observe_rate_limit(response: httpx.Response) -> None:
+    global _PACE_UNTIL
+    headers = response.headers
+    if response.status_code != 429:
+        remaining = headers.get("x-ratelimit-remaining")
+        try:
+            if remaining is None or float(remaining) > 0:
+                return
+        except ValueError:
+            return
+    delay = _header_delay(headers)
+    if delay:
+        _PACE_UNTIL = max(_PACE_UNTIL, time.monotonic() + delay)
 
 
-async def _retry(coro_fn, max_tries: int = 5, base: float = 0.5, retry_on=None):
+async def _pace() -> None:
+    delay = _PACE_UNTIL - time.monotonic()
+    if delay > 0:
+        await asyncio.sleep(delay)
+
+
+@lru_cache
+def _retry_disabled() -> bool:
+    # Read once per process; tests set OPENROUTER_DISABLE_RETRY before importing this module.
+    return os.getenv("OPENROUTER_DISABLE_RETRY", "").strip() != ""
+
+
+async def _retry(
+    coro_fn,
+    max_tries: int = 5,
+    base: float = 0.5,
+    retry_on=None,
+    max_backoff: float = _MAX_BACKOFF_S,
+):
     """
-    Exponential backoff for transient conditions:
+    Backoff with decorrelated jitter for transient conditions:
       - 429 (rate limit), 408 (timeout), 5xx, network/timeout errors.
     Never retries 402 (insufficient credits).
+    A Retry-After / X-RateLimit-Reset header on the error overrides the computed delay, and a
+    retry_on predicate may return a float to request a specific delay. Computed delays are
+    capped at max_backoff; server-requested ones at _RETRY_CAP_S.
     """
-    disable_retry = os.getenv("OPENROUTER_DISABLE_RETRY", "").strip() != ""
-    attempts = 1 if disable_retry else max_tries
-    for i in range(attempts):
+    if _retry_disabled():
+        return await coro_fn()
+    last = max_tries - 1
+    prev_delay = base
+    for i in range(max_tries):
         try:
             return await coro_fn()
-        except (RateLimitError, APITimeoutError, APIConnectionError):
-            # always back off for these
-            if i == attempts - 1:
-                raise
-            await asyncio.sleep(base * (2 ** i) + random.random() * 0.1)
-        except APIStatusError as e:
-            code = getattr(e, "status_code", None)
-            if code == 402:
-                # no credits – surface immediately
-                raise
-            if code in (408, 429, 500, 502, 503, 504):
-                if i == attempts - 1:
-                    raise
-                await asyncio.sleep(base * (2 ** i) + random.random() * 0.1)
-            else:
-                raise
         except Exception as e:
-            # Optional predicate for non-OpenAI paths (e.g., httpx)
-            should_retry = bool(retry_on(e)) if callable(retry_on) else False
-            if not should_retry:
+            verdict = _retry_verdict(e, retry_on)
+            if verdict is False or i == last:
                 raise
-            if i == attempts - 1:
-                raise
-            await asyncio.sleep(base * (2 ** i) + random.random() * 0.1)
+            # A float verdict is an explicit delay; otherwise a server hint beats the computed one.
+            hint = verdict if type(verdict) is float else _retry_after_seconds(e)
+        # Decorrelated jitter: spreads competing clients apart instead of retrying in lockstep.
+        prev_delay = min(max_backoff, random.uniform(base, prev_delay * 3))
+        await asyncio.sleep(hint if hint is not None else prev_delay)
+
+
+_RETRY_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+def _retry_verdict(exc: Exception, retry_on) -> Union[bool, float]:
+    """False to re-raise, True to back off, or a float delay requested by retry_on."""
+    if isinstance(exc, (RateLimitError, APITimeoutError, APIConnectionError)):
+        # always back off for these
+        return True
+    if isinstance(exc, APIStatusError):
+        # 402 (no credits) and other non-transient statuses surface immediately
+        return getattr(exc, "status_code", None) in _RETRY_STATUS_CODES
+    # Optional predicate for non-OpenAI paths (e.g., httpx)
+    verdict = retry_on(exc) if callable(retry_on) else False
+    if isinstance(verdict, (int, float)) and not isinstance(verdict, bool):
+        return float(verdict)
+    return bool(verdict)
 
 
 # -------------- Public stateless helpers -------------- #
@@ -670,17 +1022,15 @@ async def chat(
     """
     Stateless chat. Returns the assistant message string.
     """
-    # Merge stored per-model params (if any), filtered to supported keys.
-    # IMPORTANT: We pass all merged params via `extra_body` to avoid the OpenAI
-    # Python SDK rejecting unknown provider-specific fields (e.g., "reasoning").
-    merged_kwargs = await _merge_model_params(model, kwargs)
-
-    # Use the richer helper and return only textual content for backward compatibility
+    # Use the richer helper and return only textual content for backward compatibility.
+    # It merges stored per-model params itself (passed via `extra_body`), so kwargs go
+    # through untouched. The metadata is discarded here, so skip the /generation round-trip.
     content, _meta = await chat_with_meta(
         messages=messages,
         model=model,
         allow_tools=allow_tools,
-        **merged_kwargs,
+        fetch_generation_meta=False,
+        **kwargs,
     )
     return content or ""
 
@@ -696,7 +1046,7 @@ async def vision_single(
     containing prompt + image. Prefer using Conversation for multi-turn or multi-image.
     """
     s = _settings()
-    data_url = encode_image_to_data_url(image)
+    data_url = await encode_image_to_data_url_async(image)
     msgs = [{
         "role": "user",
         "content": [
@@ -712,11 +1062,35 @@ async def vision_single(
     )
 
 
+async def vision_many(
+    items: Sequence[tuple[str, Union[bytes, str, Path]]],
+    model: Optional[str] = None,
+    *,
+    max_concurrency: int = 8,
+    **kwargs,
+) -> List[str]:
+    """
+    Run vision_single over (prompt, image) pairs concurrently; replies come back in input order.
+    At most max_concurrency items (encode + request) run at once, and requests also share
+    the process-wide chat concurrency cap.
+    """
+    sem = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def one(prompt: str, image: Union[bytes, str, Path]) -> str:
+        async with sem:
+            return await vision_single(prompt, image, model=model, **kwargs)
+
+    return list(await asyncio.gather(*(one(prompt, image) for prompt, image in items)))
+
+
 async def chat_with_meta(
     messages: List[Dict[str, Any]],
     model: Optional[str] = None,
     *,
     allow_tools: bool = True,
+    fetch_generation_meta: bool = True,
+    dedupe_inflight: bool = False,
+    use_stored_params: bool = True,
     **kwargs,
 ) -> tuple[str, Dict[str, Any]]:
     """
@@ -728,7 +1102,31 @@ async def chat_with_meta(
         - reasoning: str (provider-specific reasoning text if present)
         - total_cost: float | None (USD, from GET /generation)
         - generation_time: float | None (seconds, from GET /generation)
+
+    With fetch_generation_meta=False the GET /generation lookup is skipped and both
+    total_cost and generation_time are None.
+
+    With dedupe_inflight=True, a call identical to one already in flight (same model,
+    messages, options) awaits that request instead of sending its own. Opt-in, since
+    tool-using turns have side effects a follower would silently skip.
+
+    With use_stored_params=False the per-model stored params and reasoning defaults
+    are not merged in; kwargs are sent exactly as given (for callers that pass all
+    of their params explicitly).
     """
+    if dedupe_inflight:
+        key = _inflight_key(model, messages, allow_tools, fetch_generation_meta, use_stored_params, kwargs)
+        return await _singleflight(
+            key,
+            lambda: chat_with_meta(
+                messages,
+                model,
+                allow_tools=allow_tools,
+                fetch_generation_meta=fetch_generation_meta,
+                use_stored_params=use_stored_params,
+                **kwargs,
+            ),
+        )
     ctx_token = None
     if not context_data.has_context():
         # Stateless callers get a minimal context with a fresh tool counter.
@@ -738,6 +1136,8 @@ async def chat_with_meta(
             messages=messages,
             model=model,
             allow_tools=allow_tools,
+            fetch_generation_meta=fetch_generation_meta,
+            use_stored_params=use_stored_params,
             **kwargs,
         )
     finally:
@@ -745,22 +1145,138 @@ async def chat_with_meta(
             context_data.restore_context(ctx_token)
 
 
+def _json_default(obj: Any) -> Any:
+    # SDK objects (e.g. a message echoed back into the conversation) serialize as their dump.
+    dump = getattr(obj, "model_dump", None)
+    if callable(dump):
+        return dump(exclude_none=True)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _serialize_chat_body(payload: Dict[str, Any], extra: Dict[str, Any]) -> bytes:
+    """Encode a /chat/completions request body once with orjson.
+
+    Stored/provider params are merged over the top-level fields, which is exactly how
+    the SDK applies `extra_body`.
+    """
+    return orjson.dumps({**payload, **extra} if extra else payload, default=_json_default)
+
+
+_DEFAULT_MAX_CONCURRENCY = 16
+_MAX_CONCURRENCY: Optional[int] = None
+# Per-loop request slots, for the same reason clients are per loop.
+_LOOP_SEMAPHORES: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.BoundedSemaphore]" = weakref.WeakKeyDictionary()
+
+
+def _max_concurrency() -> int:
+    global _MAX_CONCURRENCY
+    if _MAX_CONCURRENCY is None:
+        raw = os.getenv("OPENROUTER_MAX_CONCURRENCY", "").strip()
+        try:
+            _MAX_CONCURRENCY = max(1, int(raw)) if raw else _DEFAULT_MAX_CONCURRENCY
+        except ValueError:
+            raise RuntimeError(f"OPENROUTER_MAX_CONCURRENCY must be an integer, got {raw!r}")
+    return _MAX_CONCURRENCY
+
+
+def set_max_concurrency(n: int) -> None:
+    """Cap concurrent chat completion requests; applies to requests started afterwards."""
+    global _MAX_CONCURRENCY
+    _MAX_CONCURRENCY = max(1, int(n))
+    with _CLIENTS_LOCK:
+        _LOOP_SEMAPHORES.clear()
+
+
+def _request_slots() -> asyncio.BoundedSemaphore:
+    return _per_loop(_LOOP_SEMAPHORES, lambda: asyncio.BoundedSemaphore(_max_concurrency()))
+
+
+async def _post_chat_completion(body: bytes) -> ChatCompletion:
+    # Goes through the SDK client, so auth headers, status-error types and response
+    # parsing are unchanged; only the JSON encoding of the body is ours.
+    # The slot is held only for the HTTP call itself: _retry calls this per attempt, so a
+    # request sleeping in backoff does not occupy capacity.
+    await _pace()
+    async with _request_slots():
+        return await _client().post(
+            "/chat/completions",
+            cast_to=ChatCompletion,
+            content=body,
+            options={"headers": {"Content-Type": "application/json"}},
+        )
+
+
+# In-flight chat_with_meta(dedupe_inflight=True) calls, keyed per loop + request hash.
+_INFLIGHT: Dict[tuple[int, str], "asyncio.Future[tuple[str, Dict[str, Any]]]"] = {}
+
+
+def _inflight_key(model: Optional[str], messages: Any, *options: Any) -> str:
+    blob = orjson.dumps([model, messages, options], option=orjson.OPT_SORT_KEYS, default=str)
+    return hashlib.blake2b(blob, digest_size=16).hexdigest()
+
+
+async def _singleflight(key: str, call) -> tuple[str, Dict[str, Any]]:
+    slot = (id(asyncio.get_running_loop()), key)
+    while (pending := _INFLIGHT.get(slot)) is not None:
+        # asyncio.wait raises only if this follower is cancelled; the leader's own
+        # cancellation shows up as pending.cancelled() and is not inherited.
+        await asyncio.wait((pending,))
+        if pending.cancelled():
+            # Leader was cancelled: loop round and re-issue the call (the first follower back
+            # becomes the new leader, the rest follow it).
+            continue
+        content, meta = pending.result()
+        # Followers get their own meta dict and their own copy of the conversation (which
+        # callers extend/edit), so they cannot mutate each other's results. Other nested
+        # values are shared read-only.
+        own = dict(meta)
+        if isinstance(own.get("messages"), list):
+            own["messages"] = [dict(m) if isinstance(m, dict) else m for m in own["messages"]]
+        return content, own
+    fut: "asyncio.Future[tuple[str, Dict[str, Any]]]" = asyncio.get_running_loop().create_future()
+    # Mark a failure as retrieved when nobody else was waiting on it.
+    fut.add_done_callback(lambda f: f.cancelled() or f.exception())
+    _INFLIGHT[slot] = fut
+    try:
+        result = await call()
+    except asyncio.CancelledError:
+        fut.cancel()
+        raise
+    except BaseException as exc:
+        fut.set_exception(exc)
+        raise
+    else:
+        fut.set_result(result)
+        return result
+    finally:
+        if _INFLIGHT.get(slot) is fut:
+            del _INFLIGHT[slot]
+
+
 async def _chat_with_meta_impl(
     messages: List[Dict[str, Any]],
     model: Optional[str] = None,
     *,
     allow_tools: bool = True,
+    fetch_generation_meta: bool = True,
+    use_stored_params: bool = True,
     **kwargs,
 ) -> tuple[str, Dict[str, Any]]:
     s = _settings()
 
-    # Merge stored per-model params (if any), filtered to supported keys, as in chat()
-    merged_kwargs = await _merge_model_params(model, kwargs)
+    if use_stored_params:
+        # Merge stored per-model params (if any), filtered to supported keys
+        merged_kwargs = await _merge_model_params(model, kwargs)
+    else:
+        # Tool availability is still managed centrally; ignore external overrides
+        merged_kwargs = {k: v for k, v in kwargs.items() if k not in ("tools", "tool_choice")}
 
     slug = model or s.code_model
-    conversation = [dict(m) for m in messages]
-    info = await _get_model_info(slug)
-    tool_specs = list(DEFAULT_TOOL_SPECS) if (allow_tools and _model_supports_tools(info)) else []
+    # Shallow copy: messages are only appended, never edited in place, so the caller's
+    # dicts (often carrying large image data URLs) can be shared rather than copied.
+    conversation = list(messages)
+    info = await get_model_info(slug)
+    tool_specs = _browser_tool_specs() if (allow_tools and _model_supports_tools(info)) else ()
     max_tool_hops = 100
     res = None
     last_tool_calls: Sequence[Any] = []
@@ -770,17 +1286,18 @@ async def _chat_with_meta_impl(
     use_streaming = False
 
     for _ in range(max_tool_hops):
+        payload = {
+            "model": slug,
+            "messages": conversation,
+            "stream": use_streaming,
+        }
+        if tool_specs:
+            payload["tools"] = tool_specs
+            payload["tool_choice"] = "auto"
+        body = _serialize_chat_body(payload, merged_kwargs)
+
         async def call():
-            payload = {
-                "model": slug,
-                "messages": conversation,
-                "stream": use_streaming,
-                "extra_body": merged_kwargs or None,
-            }
-            if tool_specs:
-                payload["tools"] = tool_specs
-                payload["tool_choice"] = "auto"
-            return await _client().chat.completions.create(**payload)
+            return await _post_chat_completion(body)
 
         res = await _retry(call)
         msg = res.choices[0].message
@@ -788,11 +1305,9 @@ async def _chat_with_meta_impl(
         last_tool_calls = tool_calls
         if tool_specs and tool_calls:
             conversation.append(msg.model_dump(exclude_none=True))
-            for tc in tool_calls:
-                fn = getattr(tc, "function", None)
-                if not fn:
-                    continue
-                output = await _execute_tool_call(slug, fn.name, fn.arguments)
+            calls = [(tc, tc.function) for tc in tool_calls if getattr(tc, "function", None)]
+            outputs = await _run_tool_calls(slug, [fn for _, fn in calls])
+            for (tc, fn), output in zip(calls, outputs):
                 conversation.append({
                     "role": "tool",
                     "tool_call_id": getattr(tc, "id", ""),
@@ -805,14 +1320,13 @@ async def _chat_with_meta_impl(
         break
 
     if not completed and tool_specs and last_tool_calls:
+        final_body = _serialize_chat_body(
+            {"model": slug, "messages": conversation, "stream": use_streaming},
+            merged_kwargs,
+        )
+
         async def final_call():
-            payload = {
-                "model": slug,
-                "messages": conversation,
-                "stream": use_streaming,
-                "extra_body": merged_kwargs or None,
-            }
-            return await _client().chat.completions.create(**payload)
+            return await _post_chat_completion(final_body)
 
         res = await _retry(final_call)
         msg = res.choices[0].message
@@ -864,14 +1378,13 @@ async def _chat_with_meta_impl(
     total_cost: Optional[float] = None
     generation_time: Optional[float] = None
     try:
-        if req_id:
-            import httpx  # OpenAI SDK depends on httpx, so it's available
+        if req_id and fetch_generation_meta:
             url = f"{s.base_url}/generation"
             headers = {"Authorization": f"Bearer {s.api_key}"}
 
             async def _get_generation():
-                async with httpx.AsyncClient(timeout=TIMEOUT_SECONDS) as http:
-                    resp = await http.get(url, params={"id": req_id}, headers=headers)
+                # Same pooled client as the SDK: the lookup rides an already-open connection.
+                resp = await _httpx_client().get(url, params={"id": req_id}, headers=headers)
                 # Raise for non-2xx to unify handling
                 resp.raise_for_status()
                 return resp.json() or {}
@@ -917,7 +1430,7 @@ async def _chat_with_meta_impl(
     conversation_snapshot: List[Dict[str, Any]] = []
     for entry in conversation:
         try:
-            conversation_snapshot.append(json.loads(json.dumps(entry, ensure_ascii=False)))
+            conversation_snapshot.append(orjson.loads(orjson.dumps(entry, default=_json_default)))
         except Exception:
             try:
                 conversation_snapshot.append(dict(entry))
@@ -1,17 +1,30 @@
 from __future__ import annotations
 
-from typing import List, Dict
+from functools import lru_cache
+from typing import Iterable, List, Dict
 
 from nicegui import ui
 from . import or_client as orc
 from . import model_params as mp
 
 
+@lru_cache(maxsize=256)
+def _canon_supported(params: tuple[str, ...]) -> tuple[str, ...]:
+    """Sorted, de-duplicated parameter names; memoized since models share a few param lists."""
+    return tuple(sorted({str(x) for x in params}))
+
+
+_TABLE_COLUMNS = [
+    {'name': 'parameter', 'label': 'Parameter', 'field': 'parameter', 'align': 'left', 'style': 'width: 35%'},
+    {'name': 'value', 'label': 'Value', 'field': 'value', 'align': 'left'},
+]
+
+
 async def _resolve_supported(slug: str) -> List[str]:
     try:
-        models = await orc.list_models(force_refresh=False, limit=2000)
-        sp = next((m.supported_parameters for m in models if m.id == slug), []) or []
-        return sorted({str(x) for x in sp})
+        # Slug lookup in the shared catalog index; no per-open fetch or list scan.
+        info = await orc.get_model_info(slug)
+        return list(_canon_supported(tuple(info.supported_parameters))) if info else []
     except Exception:
         return []
 
@@ -33,37 +46,51 @@ async def open_params_dialog(slug: str, title_name: str | None = None) -> None:
                 .props('flat round dense')\
                 .style('position: absolute; top: 8px; right: 8px;')
 
-            with ui.column().classes('gap-2 w-full'):
-                # Simple, reliable two-column grid (avoids QTable slot issues)
-                # Use minmax(0, ...) to prevent horizontal overflow and hide any accidental x-scroll.
-                grid = ui.element('div')\
-                    .style('display: grid; grid-template-columns: minmax(200px, 1fr) minmax(0, 2fr); gap: 10px; max-width: 100%;')\
-                    .classes('w-full max-h-[60vh] overflow-y-auto overflow-x-hidden')
-                inputs: Dict[str, ui.input] = {}
-                with grid:
-                    for p in supported:
-                        ui.label(p).classes('text-sm font-mono break-words')
-                        inputs[p] = ui.input(value='').props('dense outlined clearable hide-bottom-space').classes('w-full').style('max-width: 100%; box-sizing: border-box;')
-
-            # Prefill values
             try:
                 existing = mp.get_params(slug)
-                for k, inp in inputs.items():
-                    try:
-                        inp.set_value(existing.get(k, ''))
-                    except Exception:
-                        inp.value = existing.get(k, '')
             except Exception:
-                pass
+                existing = {}
+
+            with ui.column().classes('gap-2 w-full'):
+                # One virtualized QTable instead of a label + input per parameter: Quasar recycles
+                # the row DOM and the server keeps a single component. Edits are pushed back through
+                # an 'edit' event so table.rows stays the source of truth for _save.
+                table = ui.table(
+                    columns=_TABLE_COLUMNS,
+                    rows=build_rows_for_table(supported, existing),
+                    row_key='parameter',
+                    pagination=0,
+                ).props('virtual-scroll dense flat hide-bottom')\
+                    .classes('w-full')\
+                    .style('max-height: 60vh;')
+                table.add_slot('body-cell-parameter', r'''
+                    <q-td key="parameter" :props="props" class="font-mono text-sm" style="white-space: normal; word-break: break-word;">
+                        {{ props.row.parameter }}
+                    </q-td>
+                ''')
+                table.add_slot('body-cell-value', r'''
+                    <q-td key="value" :props="props">
+                        <q-input v-model="props.row.value" dense outlined clearable hide-bottom-space
+                            @update:model-value="() => $parent.$emit('edit', props.row)" />
+                    </q-td>
+                ''')
+                rows_by_key = {row['parameter']: row for row in table.rows}
+
+                def _on_edit(e) -> None:
+                    row = rows_by_key.get(str((e.args or {}).get('parameter', '')))
+                    if row is not None:
+                        row['value'] = str(e.args.get('value') or '')
+
+                table.on('edit', _on_edit)
 
             with ui.row().classes('justify-end gap-2'):
                 def _save():
                     try:
                         collected: Dict[str, str] = {}
-                        for k, inp in inputs.items():
-                            v = str(getattr(inp, 'value', '') or '').strip()
+                        for row in table.rows:
+                            v = str(row.get('value') or '').strip()
                             if v:
-                                collected[k] = v
+                                collected[row['parameter']] = v
                         mp.set_params(slug, collected)
                         ui.notify('Parameters saved')
                         dlg.close()
@@ -75,12 +102,10 @@ async def open_params_dialog(slug: str, title_name: str | None = None) -> None:
     dlg.open()
 
 
-def build_rows_for_table(supported: List[str] | None, existing: Dict[str, str] | None, fallback: List[str] | None = None) -> List[Dict[str, str]]:
+def build_rows_for_table(supported: Iterable[str] | None, existing: Dict[str, str] | None, fallback: List[str] | None = None) -> List[Dict[str, str]]:
     """Pure helper to build table rows from supported keys and existing values.
 
     Build rows from supported keys; if none provided, returns an empty list (no fallback).
     """
-    supp = list(sorted({str(x) for x in (supported or [])}))
     exist = existing or {}
-    rows = [{"parameter": p, "value": str(exist.get(p, ""))} for p in supp]
-    return rows
+    return [{"parameter": p, "value": str(exist.get(p, ""))} for p in _canon_supported(tuple(supported or ()))]
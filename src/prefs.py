@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
+from typing import Dict
 
 
 _PREFS_PATH = Path.home() / ".simple-vibe-iterator" / "prefs.json"
@@ -16,6 +17,15 @@ def get(key: str, default: str = "") -> str:
         return default
 
 
+def get_many(defaults: Dict[str, str]) -> Dict[str, str]:
+    """Read several keys with a single load of the prefs file; missing keys use their defaults."""
+    try:
+        data = json.loads(_PREFS_PATH.read_text(encoding="utf-8"))
+        return {key: str(data.get(str(key), default)) for key, default in defaults.items()}
+    except Exception:
+        return dict(defaults)
+
+
 def set(key: str, value: str) -> None:
     try:
         try:
@@ -4,12 +4,15 @@ from __future__ import annotations
 import asyncio
 import base64
 import hashlib
+import logging
 import mimetypes
+import os
 import time
 import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Sequence
+from typing import AsyncIterator, Dict, List, Sequence
 
 from .interfaces import AICodeService, BrowserService, VisionService
 from .image_downscale import load_scaled_image_bytes
@@ -18,17 +21,27 @@ from .prompt_builder import PromptPayload
 from .feedback_presets import FeedbackPreset
 from .chrome_devtools_service import ChromeDevToolsService, bind_chrome_devtools_agent
 
+logger = logging.getLogger(__name__)
 
-def _write_html_artifact(target: Path, html_code: str) -> None:
+# Warm DevTools sessions kept after a capture; each one is a live Chrome, so bursts beyond
+# this are closed on release instead of lingering.
+_MAX_IDLE_SESSIONS = 4
+_MIN_SESSION_CAP = 4
+
+
+def _write_html_artifact(target: Path, html_code: str | bytes) -> None:
     target.parent.mkdir(parents=True, exist_ok=True)
-    target.write_text(html_code, encoding="utf-8")
+    if isinstance(html_code, bytes):
+        target.write_bytes(html_code)
+    else:
+        target.write_text(html_code, encoding="utf-8")
 
 
-def _save_data_url(data_url: str, target: Path) -> None:
-    if not data_url or "," not in data_url:
-        return
-    _, payload = data_url.split(",", 1)
-    target.write_bytes(base64.b64decode(payload))
+async def _close_quietly(service: ChromeDevToolsService) -> None:
+    try:
+        await service.aclose()
+    except Exception:
+        pass
 
 
 def _format_console_entries(entries: List[Dict[str, str]]) -> List[str]:
@@ -43,9 +56,70 @@ def _format_console_entries(entries: List[Dict[str, str]]) -> List[str]:
 class DevToolsBrowserService(BrowserService):
     """Default browser implementation backed by Chrome DevTools MCP."""
 
-    def __init__(self, out_dir: Path | None = None) -> None:
+    def __init__(
+        self,
+        out_dir: Path | None = None,
+        *,
+        max_idle_sessions: int = _MAX_IDLE_SESSIONS,
+        max_sessions: int | None = None,
+    ) -> None:
         self._out_dir = Path(out_dir or "artifacts").resolve()
         self._out_dir.mkdir(parents=True, exist_ok=True)
+        self._max_idle = max(0, int(max_idle_sessions))
+        # Per-model captures fan out in parallel, one Chrome each; cap them near the core count
+        # (at least 4, since a capture mostly waits on page timers rather than CPU).
+        self._max_sessions = max(1, int(max_sessions or max(_MIN_SESSION_CAP, os.cpu_count() or 1)))
+        self._slots: asyncio.Semaphore | None = None
+        # Warm DevTools sessions kept between captures so Chrome/MCP startup is paid once,
+        # not per screenshot. Sessions belong to the event loop that started them.
+        self._idle: List[ChromeDevToolsService] = []
+        self._idle_loop: asyncio.AbstractEventLoop | None = None
+
+    @asynccontextmanager
+    async def _session(self) -> AsyncIterator[ChromeDevToolsService]:
+        """Borrow a DevTools session, waiting while max_sessions captures are already running."""
+        loop = asyncio.get_running_loop()
+        if self._idle_loop is not loop:
+            # Sessions from a finished loop cannot be driven or awaited from this one, but each
+            # still owns a Chrome process: kill those directly instead of leaking them.
+            for stale in self._idle:
+                stale.kill()
+            self._idle = []
+            self._idle_loop = loop
+            self._slots = asyncio.Semaphore(self._max_sessions)
+        async with self._slots:
+            async with self._borrow() as service:
+                yield service
+
+    @asynccontextmanager
+    async def _borrow(self) -> AsyncIterator[ChromeDevToolsService]:
+        """A warm session reset to about:blank, or a new one."""
+        service: ChromeDevToolsService | None = None
+        while self._idle and service is None:
+            service = self._idle.pop()
+            try:
+                await service.reset_page_mcp()
+            except Exception as exc:
+                logger.warning("Discarding DevTools session that failed to reset: %s", exc)
+                await _close_quietly(service)
+                service = None
+        if service is None:
+            service = ChromeDevToolsService()
+        healthy = False
+        try:
+            yield service
+            healthy = True
+        finally:
+            if healthy and service.enabled and len(self._idle) < self._max_idle:
+                self._idle.append(service)
+            else:
+                await _close_quietly(service)
+
+    async def aclose(self) -> None:
+        """Close the warm DevTools sessions."""
+        idle, self._idle = self._idle, []
+        for service in idle:
+            await _close_quietly(service)
 
     async def render_and_capture(
         self,
@@ -55,10 +129,19 @@ class DevToolsBrowserService(BrowserService):
         capture_count: int = 1,
         interval_seconds: float = 1.0,
     ) -> tuple[List[str], List[str]]:
-        service = ChromeDevToolsService()
-        if not service.enabled:
-            raise RuntimeError("Chrome DevTools MCP is not configured; cannot capture screenshots.")
+        async with self._session() as service:
+            if not service.enabled:
+                raise RuntimeError("Chrome DevTools MCP is not configured; cannot capture screenshots.")
+            return await self._render_and_capture(service, html_code, worker, capture_count, interval_seconds)
 
+    async def _render_and_capture(
+        self,
+        service: ChromeDevToolsService,
+        html_code: str,
+        worker: str,
+        capture_count: int,
+        interval_seconds: float,
+    ) -> tuple[List[str], List[str]]:
         count = max(1, int(capture_count or 1))
         try:
             interval = float(interval_seconds)
@@ -67,35 +150,36 @@ class DevToolsBrowserService(BrowserService):
         if interval <= 0:
             interval = 1.0
 
-        digest = hashlib.sha1(html_code.encode("utf-8")).hexdigest()[:12]
+        # Encode once: the digest and every per-frame HTML copy share these bytes.
+        html_bytes = html_code.encode("utf-8")
+        digest = hashlib.sha1(html_bytes).hexdigest()[:12]
         token = uuid.uuid4().hex[:8]
         base_html = self._out_dir / f"page_{digest}_{token}.html"
-        _write_html_artifact(base_html, html_code)
+        _write_html_artifact(base_html, html_bytes)
 
         screenshot_paths: List[str] = []
         op_status.set_phase(worker, "Screenshot|DevTools")
         try:
             await service.load_html_mcp(html_code)
+            loop = asyncio.get_running_loop()
+            started = loop.time()
             for idx in range(count):
                 if idx > 0:
-                    await asyncio.sleep(interval)
-                data_url = await service.take_screenshot_mcp()
-                if not data_url:
+                    # Pace against a fixed schedule so screenshot latency doesn't stretch the spacing.
+                    await asyncio.sleep(max(0.0, started + idx * interval - loop.time()))
+                # The page settled after loading and before the first frame; later frames only need the interval.
+                png = await service.take_screenshot_bytes_mcp(wait_ready=idx == 0)
+                if not png:
                     break
                 shot_path = self._out_dir / f"page_{digest}_{token}_{idx}.png"
-                _save_data_url(data_url, shot_path)
-                html_copy = shot_path.with_suffix(".html")
-                if not html_copy.exists():
-                    _write_html_artifact(html_copy, html_code)
+                shot_path.write_bytes(png)
+                # Names are unique per capture token and frame, so no existence check is needed.
+                shot_path.with_suffix(".html").write_bytes(html_bytes)
                 screenshot_paths.append(str(shot_path))
             log_entries = await service.get_console_messages_mcp()
             log_strings = _format_console_entries(log_entries)
         finally:
             op_status.clear_phase(worker)
-            try:
-                await service.aclose()
-            except Exception:
-                pass
         return screenshot_paths, log_strings
 
     async def run_feedback_preset(
@@ -106,14 +190,23 @@ class DevToolsBrowserService(BrowserService):
     ) -> tuple[List[str], List[str], List[str]]:
         if not preset.actions:
             return ([], [], [])
-        service = ChromeDevToolsService()
-        if not service.enabled:
-            raise RuntimeError("Chrome DevTools MCP is not configured; cannot run feedback preset.")
+        async with self._session() as service:
+            if not service.enabled:
+                raise RuntimeError("Chrome DevTools MCP is not configured; cannot run feedback preset.")
+            return await self._run_feedback_preset(service, html_code, preset, worker)
 
-        digest = hashlib.sha1(html_code.encode("utf-8")).hexdigest()[:12]
+    async def _run_feedback_preset(
+        self,
+        service: ChromeDevToolsService,
+        html_code: str,
+        preset: FeedbackPreset,
+        worker: str,
+    ) -> tuple[List[str], List[str], List[str]]:
+        html_bytes = html_code.encode("utf-8")
+        digest = hashlib.sha1(html_bytes).hexdigest()[:12]
         token = uuid.uuid4().hex[:8]
         base_html = self._out_dir / f"preset_{digest}_{token}.html"
-        _write_html_artifact(base_html, html_code)
+        _write_html_artifact(base_html, html_bytes)
 
         screenshot_paths: List[str] = []
         screenshot_labels: List[str] = []
@@ -130,26 +223,20 @@ class DevToolsBrowserService(BrowserService):
                 elif kind == "keypress":
                     await service.press_key_mcp(action.key or "", max(0, int(action.duration_ms)))
                 elif kind == "screenshot":
-                    data_url = await service.take_screenshot_mcp()
-                    if not data_url:
+                    png = await service.take_screenshot_bytes_mcp()
+                    if not png:
                         continue
                     filename = f"preset_{preset.id}_{token}_{shot_idx}.png"
                     shot_idx += 1
                     path = self._out_dir / filename
-                    _save_data_url(data_url, path)
-                    html_copy = path.with_suffix(".html")
-                    if not html_copy.exists():
-                        _write_html_artifact(html_copy, html_code)
+                    path.write_bytes(png)
+                    path.with_suffix(".html").write_bytes(html_bytes)
                     label = action.label or f"shot-{shot_idx}"
                     screenshot_paths.append(str(path))
                     screenshot_labels.append(label)
             log_entries = await service.get_console_messages_mcp()
         finally:
             op_status.clear_phase(worker)
-            try:
-                await service.aclose()
-            except Exception:
-                pass
         log_strings = _format_console_entries(log_entries)
         return screenshot_paths, log_strings, screenshot_labels
 
@@ -277,7 +364,7 @@ class OpenRouterVisionService(VisionService):
             scaled_bytes = load_scaled_image_bytes(path)
             data_source = scaled_bytes if scaled_bytes is not None else path
             try:
-                data_url = or_client.encode_image_to_data_url(data_source)
+                data_url = await or_client.encode_image_to_data_url_async(data_source)
             except Exception:
                 continue
             parts.append({"type": "image_url", "image_url": {"url": data_url}})
@@ -4,6 +4,7 @@ Unified application settings management for app-wide preferences.
 """
 
 from __future__ import annotations
+from dataclasses import replace
 from typing import Optional
 from .interfaces import TransitionSettings
 from . import prefs
@@ -16,24 +17,23 @@ class Settings:
 
     def __init__(self):
         """Initialize the settings manager."""
-        pass
+        # Last loaded settings (goal/feedback excluded); dropped whenever a setter writes prefs.
+        self._loaded: Optional[TransitionSettings] = None
 
     def get_code_model(self) -> str:
         cfg = app_config.get_config()
-        stored = prefs.get('model.code', cfg.code_model)
-        value = (stored or '').strip() or cfg.code_model
-        return value
+        return self._resolve_model(prefs.get('model.code', cfg.code_model), cfg.code_model)
 
     def set_code_model(self, value: str) -> None:
+        self._loaded = None
         prefs.set('model.code', value.strip())
 
     def get_vision_model(self) -> str:
         cfg = app_config.get_config()
-        stored = prefs.get('model.vision', cfg.vision_model)
-        value = (stored or '').strip() or cfg.vision_model
-        return value
+        return self._resolve_model(prefs.get('model.vision', cfg.vision_model), cfg.vision_model)
 
     def set_vision_model(self, value: str) -> None:
+        self._loaded = None
         prefs.set('model.vision', value.strip())
 
     def get_code_template(self) -> str:
@@ -54,15 +54,8 @@ class Settings:
 
     def get_input_screenshot_count(self) -> int:
         cfg = app_config.get_config()
-        fallback = str(cfg.input_screenshot_default)
-        raw = prefs.get('input.screenshot.count', fallback)
-        try:
-            value = int(raw)
-        except Exception:
-            value = cfg.input_screenshot_default
-        if value < 1:
-            value = 1
-        return value
+        raw = prefs.get('input.screenshot.count', str(cfg.input_screenshot_default))
+        return self._resolve_screenshot_count(raw, cfg.input_screenshot_default)
 
     def set_input_screenshot_count(self, value: int) -> None:
         try:
@@ -71,31 +64,66 @@ class Settings:
             count = 1
         if count < 1:
             count = 1
+        self._loaded = None
         prefs.set('input.screenshot.count', str(count))
 
     def get_feedback_preset_id(self) -> str:
         fallback = feedback_presets.get_initial_preset_id()
-        raw = prefs.get('feedback.preset.id', fallback)
-        return (raw or fallback or '').strip() or fallback
+        return self._resolve_preset_id(prefs.get('feedback.preset.id', fallback), fallback)
 
     def set_feedback_preset_id(self, preset_id: str | None) -> None:
+        self._loaded = None
         prefs.set('feedback.preset.id', (preset_id or '').strip())
 
     def load_settings(self, overall_goal: str = '', user_feedback: str = '') -> TransitionSettings:
         """Load complete settings."""
+        if self._loaded is None:
+            self._loaded = self._read_settings()
+        return replace(self._loaded, overall_goal=overall_goal, user_feedback=user_feedback)
+
+    def _read_settings(self) -> TransitionSettings:
+        cfg = app_config.get_config()
+        preset_fallback = feedback_presets.get_initial_preset_id()
+        # One prefs file read for all stored values instead of one per getter.
+        stored = prefs.get_many({
+            'model.code': cfg.code_model,
+            'model.vision': cfg.vision_model,
+            'input.screenshot.count': str(cfg.input_screenshot_default),
+            'feedback.preset.id': preset_fallback,
+        })
         return TransitionSettings(
-            code_model=self.get_code_model(),
-            vision_model=self.get_vision_model(),
-            overall_goal=overall_goal,
-            user_feedback=user_feedback,
-            code_template=self.get_code_template(),
-            code_system_prompt_template=self.get_code_system_prompt_template(),
-            code_first_prompt_template=self.get_code_first_prompt_template(),
-            vision_template=self.get_vision_template(),
-            input_screenshot_count=self.get_input_screenshot_count(),
-            feedback_preset_id=self.get_feedback_preset_id(),
+            code_model=self._resolve_model(stored['model.code'], cfg.code_model),
+            vision_model=self._resolve_model(stored['model.vision'], cfg.vision_model),
+            overall_goal='',
+            user_feedback='',
+            code_template=cfg.code_template,
+            code_system_prompt_template=cfg.code_system_prompt_template,
+            code_first_prompt_template=cfg.code_first_prompt_template,
+            vision_template=cfg.vision_template,
+            input_screenshot_count=self._resolve_screenshot_count(
+                stored['input.screenshot.count'], cfg.input_screenshot_default
+            ),
+            feedback_preset_id=self._resolve_preset_id(stored['feedback.preset.id'], preset_fallback),
         )
 
+    @staticmethod
+    def _resolve_model(stored: str, fallback: str) -> str:
+        return (stored or '').strip() or fallback
+
+    @staticmethod
+    def _resolve_screenshot_count(raw: str, fallback: int) -> int:
+        try:
+            value = int(raw)
+        except Exception:
+            value = fallback
+        if value < 1:
+            value = 1
+        return value
+
+    @staticmethod
+    def _resolve_preset_id(raw: str, fallback: str) -> str:
+        return (raw or fallback or '').strip() or fallback
+
     def save_settings(self, settings: TransitionSettings) -> None:
         """Persist settings."""
         self.set_code_model(settings.code_model)
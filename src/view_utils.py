@@ -3,9 +3,15 @@ from __future__ import annotations
 from .interfaces import TransitionArtifacts
 
 
+def utf8_size(text: str) -> int:
+    """Return the UTF-8 byte length of text without encoding it when it is pure ASCII."""
+    text = text or ""
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+
 def format_html_size(html: str) -> str:
     """Return size of HTML in kilobytes with two decimal places."""
-    size_kb = len((html or "").encode("utf-8")) / 1024
+    size_kb = utf8_size(html) / 1024
     return f"{size_kb:.2f} KB"
 
 